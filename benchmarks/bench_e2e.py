@@ -0,0 +1,179 @@
+# ##########################################################################################################
+# RENEW LONDON CIFS END-TO-END LATENCY BENCHMARK
+# Created on 2026-10-17
+# Property of JK Enterprises
+# v1.1.0b
+# ##########################################################################################################
+#
+# Version History:
+# ----------------
+# 2026-10-17 v1.1.0b
+#   - Initial Version.
+#
+# Usage:
+# ------
+#
+# Runs the full 'main()' pipeline (browser-free HTTP fetch, load, render, validate and publish) against the
+# local stand-in server in 'stub_server.py' under realistic and degraded conditions, and reports per-cycle
+# latency percentiles, throughput, outcomes and use of last-known-good data. Payloads are synthetic, with
+# one update's churn applied before every cycle.
+#
+# Each scenario starts from a fresh database in a temporary directory and runs one healthy, untimed cycle
+# first, so outage scenarios measure the last-known-good fallback rather than an empty database. Background
+# retries and catch-up cycles are disabled so each cycle's latency is its own.
+#
+# Instructions:
+# -------------
+# Run from the repository root:
+#
+#   python3 benchmarks/bench_e2e.py --incidents 1000 --cycles 20
+#   python3 benchmarks/bench_e2e.py --scenarios realistic api_outage --output bench_e2e.json
+#
+
+# ##########################################################################################################
+# MODULES AND DEFINITIONS
+# ##########################################################################################################
+
+# STANDARD MODULES
+# ----------------
+
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# CUSTOM MODULES
+# --------------
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import stub_server
+import synthetic
+import waze_cifs_xml as wcx
+
+# GLOBAL VARIABLE DEFINITIONS
+# ---------------------------
+
+dirRepo = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..") # Repository Root
+dScenarios = {
+	"realistic": {"fLatency": 0.15, "fJitter": 0.1}, # Typical city service response times
+	"slow": {"fLatency": 1.0, "fJitter": 1.0}, # Overloaded city service
+	"flaky": {"fLatency": 0.15, "fJitter": 0.1, "fErrorRate": 0.2}, # One request in five fails
+	"api_outage": {"fLatency": 0.15, "fJitter": 0.1, "fErrorRate": 1.0, "lParts": ["api"]} # Disruptions API down
+	} # Stand-In Server Settings per Scenario
+
+
+# ##########################################################################################################
+# MAIN PROGRAM
+# ##########################################################################################################
+
+# Function to Handle Main Program
+def main():
+	args = argparse.ArgumentParser(description="Benchmark end-to-end CIFS pipeline latency against a local stand-in server.")
+	args.add_argument("--incidents", type=int, default=1000, help="synthetic feed size in incidents (default 1000)")
+	args.add_argument("--cycles", type=int, default=20, help="timed cycles per scenario (default 20)")
+	args.add_argument("--scenarios", nargs="+", choices=sorted(dScenarios), default=sorted(dScenarios), help="scenarios to run (default all)")
+	args.add_argument("--output", help="also write results to this JSON file")
+	opts = args.parse_args()
+
+	gisData, apiData = synthetic.make_payloads(opts.incidents, synthetic.load_profile())
+	wcx.gisFetchMode = "http" # Stand-in page read without headless browser
+	wcx.nRetries = 0
+	wcx.secRetryWindow = 0
+	wcx.fMsgLog = os.devnull
+	dResults = {"incidents": opts.incidents, "cycles": opts.cycles, "scenarios": {}}
+	print("%-11s %7s %9s %9s %9s %9s %10s %6s  %s" % ("scenario", "ok %", "p50 ms", "p95 ms", "max ms", "cycles/s", "stale uses", "500s", "outcomes"))
+	for sScenario in opts.scenarios:
+		dScenario = run_scenario(gisData, apiData, dScenarios[sScenario], opts.cycles)
+		dResults["scenarios"][sScenario] = dScenario
+		print("%-11s %7.1f %9.1f %9.1f %9.1f %9.2f %10d %6d  %s" % (
+			sScenario, dScenario["ok_share"] * 100, dScenario["p50_ms"], dScenario["p95_ms"], dScenario["max_ms"],
+			dScenario["cycles_per_second"], dScenario["stale_uses"], dScenario["server_errors"],
+			", ".join(sOutcome + " " + str(n) for sOutcome, n in sorted(dScenario["outcomes"].items()))
+			))
+	if opts.output:
+		with open(opts.output, "w") as fh:
+			json.dump(dResults, fh, indent=2)
+		print("Results written to " + opts.output)
+	return
+
+
+# ##########################################################################################################
+# DEFINED FUNCTIONS
+# ##########################################################################################################
+
+# Function to Run One Full 'main()' Cycle Against Stand-In Server, Returning (seconds, run summary)
+def run_main(sURL):
+	wcx.reset_run()
+	sys.argv = ["waze_cifs_xml.py", "--base-url", sURL, "run"]
+	tStart = time.perf_counter()
+	with open(os.devnull, "w") as fhNull, contextlib.redirect_stdout(fhNull):
+		try:
+			wcx.main()
+		except SystemExit:
+			pass # Failed cycle, outcome read from run summary
+	secCycle = time.perf_counter() - tStart
+	with open(wcx.dirSource + wcx.fRunSummary) as fh:
+		return secCycle, json.load(fh)
+
+# Function to Run One Scenario in Fresh Working Directory and Summarize Cycle Latencies and Outcomes
+def run_scenario(gisData, apiData, dSettings, nCycles):
+	dirTemp = tempfile.mkdtemp()
+	server = stub_server.start_server(gisData, apiData)
+	try:
+		shutil.copyfile(os.path.join(dirRepo, wcx.fCIFSschema), os.path.join(dirTemp, wcx.fCIFSschema))
+		os.mkdir(os.path.join(dirTemp, "public"))
+		wcx.dirSource = dirTemp + os.sep
+		wcx.dirDest = os.path.join(dirTemp, "public") + os.sep
+		wcx.dirMetrics = wcx.dirSource
+		wcx.sqlConn, wcx.dSourceCache = None, None # Fresh database and source cache
+		wcx.dCachePending.clear()
+		run_main(server.url) # Healthy seed cycle, untimed
+		for sKey, value in dSettings.items():
+			setattr(server, sKey, value)
+		lSeconds, dOutcomes, nStale = [], {}, 0
+		tStart = time.perf_counter()
+		for i in range(nCycles):
+			server.churn()
+			secCycle, dSummary = run_main(server.url)
+			lSeconds.append(secCycle)
+			dOutcomes[dSummary["outcome"]] = dOutcomes.get(dSummary["outcome"], 0) + 1
+			nStale += len(dSummary.get("stale_seconds") or {})
+		secTotal = time.perf_counter() - tStart
+		if wcx.sqlConn is not None:
+			wcx.sqlConn.close()
+			wcx.sqlConn = None
+	finally:
+		server.shutdown()
+		server.server_close()
+		shutil.rmtree(dirTemp)
+	lSeconds.sort()
+	return {
+		"ok_share": float(sum(n for sOutcome, n in dOutcomes.items() if sOutcome != "failed")) / nCycles,
+		"p50_ms": percentile(lSeconds, 0.5) * 1000,
+		"p95_ms": percentile(lSeconds, 0.95) * 1000,
+		"max_ms": lSeconds[-1] * 1000,
+		"cycles_per_second": nCycles / secTotal,
+		"outcomes": dOutcomes,
+		"stale_uses": nStale,
+		"server_errors": server.stats["gis"]["errors"] + server.stats["api"]["errors"],
+		"server": server.stats
+		}
+
+# Function to Pick Percentile from Sorted Values (nearest rank)
+def percentile(lSorted, fShare):
+	return lSorted[int(round(fShare * (len(lSorted) - 1)))]
+
+# NAMESPACE CALL (DO NOT MODIFY)
+# ------------------------------
+if __name__ == "__main__":
+	main()
+
+
+# ##########################################################################################################
+# END OF SCRIPT
+# ##########################################################################################################
@@ -0,0 +1,103 @@
+# ##########################################################################################################
+# CIFS POLYLINE QUANTIZATION AND SIMPLIFICATION BENCHMARK
+# Created on 2026-10-17
+# Property of JK Enterprises
+# v1.1.0b
+# ##########################################################################################################
+#
+# Version History:
+# ----------------
+# 2026-10-17 v1.1.0b
+#   - Initial Version.
+#
+# Usage:
+# ------
+#
+# Reads the polylines of the shipped sample feed 'traffic-incidents.xml' and reports vertex count, polyline and
+# whole-feed size, and time to pack ('coord_to_blob()', as on load) and format ('blob_to_poly()', as on render)
+# for unquantized ('coordPrecision' None, 7 decimal places of the fixed-point storage) versus quantized and
+# simplified output.
+#
+# Instructions:
+# -------------
+# Run from the repository root:
+#
+#   python3 benchmarks/bench_geometry.py
+#
+
+# ##########################################################################################################
+# MODULES AND DEFINITIONS
+# ##########################################################################################################
+
+# STANDARD MODULES
+# ----------------
+
+import argparse
+import os
+import re
+import sys
+import time
+
+# CUSTOM MODULES
+# --------------
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import waze_cifs_xml as wcx
+
+# GLOBAL VARIABLE DEFINITIONS
+# ---------------------------
+
+dirRepo = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..") # Repository Root
+lConfigs = [(None, 0), (6, 0), (6, 0.5), (6, 1), (6, 2)] # (coordPrecision, mSimplifyTolerance) Pairs
+
+
+# ##########################################################################################################
+# MAIN PROGRAM
+# ##########################################################################################################
+
+# Function to Handle Main Program
+def main():
+	args = argparse.ArgumentParser(description="Benchmark CIFS polyline quantization and simplification.")
+	args.add_argument("--repeat", type=int, default=200, help="timing repetitions over the sample feed (default 200)")
+	opts = args.parse_args()
+
+	with open(os.path.join(dirRepo, wcx.fCIFSxml)) as fh:
+		sFeed = fh.read()
+	lPolylines = re.findall(r"<polyline>([^<]*)</polyline>", sFeed)
+	lLines = [poly_to_coord(sPolyline) for sPolyline in lPolylines]
+	nOriginal = sum(len(sPolyline) for sPolyline in lPolylines)
+
+	print("%-22s %9s %12s %10s %12s" % ("precision / tolerance", "vertices", "polyline B", "feed B", "us/feed"))
+	for coordPrecision, mTolerance in lConfigs:
+		wcx.coordPrecision, wcx.mSimplifyTolerance = coordPrecision, mTolerance
+		lOut = [wcx.blob_to_poly(wcx.coord_to_blob(lCoord)) for lCoord in lLines]
+		tStart = time.time()
+		for i in range(opts.repeat):
+			for lCoord in lLines:
+				wcx.blob_to_poly(wcx.coord_to_blob(lCoord))
+		usFeed = (time.time() - tStart) / opts.repeat * 1e6
+		nVertices = sum(sPolyline.count(" ") // 2 + 1 for sPolyline in lOut)
+		nPolyline = sum(len(sPolyline) for sPolyline in lOut)
+		sLabel = ("7 dp (None)" if coordPrecision is None else str(coordPrecision) + " dp") + " / " + str(mTolerance) + " m"
+		print("%-22s %9d %12d %10d %12.0f" % (sLabel, nVertices, nPolyline, len(sFeed) - nOriginal + nPolyline, usFeed))
+	return
+
+
+# ##########################################################################################################
+# DEFINED FUNCTIONS
+# ##########################################################################################################
+
+# Function to Convert Polyline String Back to [lon, lat] Coordinates
+def poly_to_coord(sPolyline):
+	lValues = [float(value) for value in sPolyline.split()]
+	return [[lValues[i + 1], lValues[i]] for i in range(0, len(lValues), 2)]
+
+# NAMESPACE CALL (DO NOT MODIFY)
+# ------------------------------
+if __name__ == "__main__":
+	main()
+
+
+# ##########################################################################################################
+# END OF SCRIPT
+# ##########################################################################################################
@@ -0,0 +1,144 @@
+# ##########################################################################################################
+# CIFS INCIDENT RECORD BENCHMARK
+# Created on 2026-10-17
+# Property of JK Enterprises
+# v1.1.0b
+# ##########################################################################################################
+#
+# Version History:
+# ----------------
+# 2026-10-17 v1.1.0b
+#   - Initial Version.
+#
+# Usage:
+# ------
+#
+# Compares the original 'create_incidents()' (one nested dict per joined row, read by position from
+# 'SELECT *') against the slotted 'Incident' records now built by the SQLite row factory in
+# 'query_incidents()'. Both read the same synthetic feed from a temporary database and format timestamps in one
+# batch. Reports construction time (join included) and memory retained per incident, as traced by
+# 'tracemalloc'.
+#
+# Instructions:
+# -------------
+# Run from the repository root:
+#
+#   python3 benchmarks/bench_incidents.py -n 100000
+#
+
+# ##########################################################################################################
+# MODULES AND DEFINITIONS
+# ##########################################################################################################
+
+# STANDARD MODULES
+# ----------------
+
+import argparse
+import contextlib
+import gc
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# CUSTOM MODULES
+# --------------
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import synthetic
+import waze_cifs_xml as wcx
+
+# GLOBAL VARIABLE DEFINITIONS
+# ---------------------------
+
+sqlSelLegacy = "SELECT * FROM gisdata INNER JOIN disruptions ON disruptions.id = gisdata.id INNER JOIN checksum ON disruptions.id = checksum.id"
+
+
+# ##########################################################################################################
+# MAIN PROGRAM
+# ##########################################################################################################
+
+# Function to Handle Main Program
+def main():
+	args = argparse.ArgumentParser(description="Benchmark CIFS incident record construction and memory.")
+	args.add_argument("-n", type=int, default=100000, help="number of synthetic incidents (default 100000)")
+	opts = args.parse_args()
+
+	dProfile = synthetic.load_profile()
+	dirTemp = tempfile.mkdtemp()
+	try:
+		wcx.dirSource = dirTemp + os.sep
+		wcx.fMsgLog = os.devnull
+		wcx.curUnixTime = dProfile["timestamp"]
+		with contextlib.redirect_stdout(io.StringIO()):
+			wcx.parse_source(*wcx.normalize_renewlondon(synthetic.make_payloads(opts.n, dProfile)))
+		print("%-22s %10s %14s %16s" % ("records", "build s", "incidents/s", "bytes/incident"))
+		for sLabel, fn in (("nested dict (legacy)", query_legacy), ("slotted Incident", wcx.query_incidents)):
+			report(sLabel, opts.n, fn)
+		wcx.get_db().close()
+	finally:
+		shutil.rmtree(dirTemp)
+	return
+
+
+# ##########################################################################################################
+# DEFINED FUNCTIONS
+# ##########################################################################################################
+
+# Function to Build Incidents with Original Implementation
+def query_legacy():
+	c = wcx.get_db().cursor()
+	c.execute(sqlSelLegacy)
+	lResults = c.fetchall()
+	dIncidents = {"timestamp": wcx.datetime_in_iso(wcx.curUnixTime), "incident": []}
+	lTimes = wcx.datetimes_in_iso([ts for incident in lResults for ts in (incident[11], incident[12], incident[3], incident[4])])
+	for i, incident in enumerate(lResults):
+		dIncidents["incident"].append({
+			"id": incident[0],
+			"sha256": incident[13],
+			"creationtime": lTimes[4 * i],
+			"updatetime": lTimes[4 * i + 1],
+			"type": incident[8],
+			"description": incident[6],
+			"short_description": incident[7],
+			"location": {
+				"street": incident[2],
+				"polyline": incident[1],
+				"direction": "BOTH_DIRECTIONS"
+				},
+			"starttime": lTimes[4 * i + 2],
+			"endtime": lTimes[4 * i + 3],
+			"source": wcx.dSourceMeta
+			})
+	return dIncidents
+
+# Function to Print Build Time and Memory Retained per Incident of One Record Kind
+def report(sLabel, n, fn):
+	wcx.format_iso.cache_clear()
+	gc.collect()
+	tStart = time.perf_counter()
+	dIncidents = fn()
+	secBuild = time.perf_counter() - tStart
+	del dIncidents
+	wcx.format_iso.cache_clear()
+	gc.collect()
+	tracemalloc.start()
+	dIncidents = fn()
+	nRetained = tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	print("%-22s %10.3f %14.0f %16.0f" % (sLabel, secBuild, n / secBuild, nRetained / float(n)))
+	return
+
+# NAMESPACE CALL (DO NOT MODIFY)
+# ------------------------------
+if __name__ == "__main__":
+	main()
+
+
+# ##########################################################################################################
+# END OF SCRIPT
+# ##########################################################################################################
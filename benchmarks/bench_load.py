@@ -0,0 +1,150 @@
+# ##########################################################################################################
+# RENEW LONDON DATABASE BULK LOAD BENCHMARK
+# Created on 2026-10-17
+# Property of JK Enterprises
+# v1.1.0b
+# ##########################################################################################################
+#
+# Version History:
+# ----------------
+# 2026-10-17 v1.1.0b
+#   - Initial Version.
+#
+# Usage:
+# ------
+#
+# Compares insert throughput of the original per-row string SQL loader (one commit per insert) against the
+# parameterized 'executemany' bulk loader used by 'parse_source()' (one transaction per run). Both run
+# against a temporary copy of the shipped 'renewlondon.db' schema using synthetic features from
+# 'synthetic.py'.
+#
+# Instructions:
+# -------------
+# Run from the repository root:
+#
+#   python3 benchmarks/bench_load.py -n 10000
+#
+
+# ##########################################################################################################
+# MODULES AND DEFINITIONS
+# ##########################################################################################################
+
+# STANDARD MODULES
+# ----------------
+
+import argparse
+import os
+import shutil
+import sqlite3 as sql
+import sys
+import tempfile
+import time
+
+# CUSTOM MODULES
+# --------------
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import synthetic
+import waze_cifs_xml as wcx
+
+# GLOBAL VARIABLE DEFINITIONS
+# ---------------------------
+
+dirRepo = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..") # Repository Root
+
+
+# ##########################################################################################################
+# MAIN PROGRAM
+# ##########################################################################################################
+
+# Function to Handle Main Program
+def main():
+	args = argparse.ArgumentParser(description="Benchmark renewlondon.db insert throughput.")
+	args.add_argument("-n", type=int, default=10000, help="number of synthetic features (default 10000)")
+	args.add_argument("--skip-legacy", action="store_true", help="skip the slow per-row commit loader")
+	opts = args.parse_args()
+
+	gisData, apiData = synthetic.make_payloads(opts.n, synthetic.load_profile())
+	dirTemp = tempfile.mkdtemp()
+	try:
+		if not opts.skip_legacy:
+			report("legacy per-row commit", opts.n, load_legacy(copy_db(dirTemp, "legacy.db"), gisData, apiData))
+		report("bulk executemany", opts.n, load_bulk(copy_db(dirTemp, "bulk.db"), gisData, apiData))
+	finally:
+		shutil.rmtree(dirTemp)
+	return
+
+
+# ##########################################################################################################
+# DEFINED FUNCTIONS
+# ##########################################################################################################
+
+# Function to Convert GIS Coordinates to Polyline String, as Stored by Original Loader
+def coord_to_poly(lCoord):
+	return " ".join(str(xy[1]) + " " + str(xy[0]) for xy in lCoord)
+
+# Function to Copy Shipped Database Schema into Temporary Directory
+def copy_db(dirTemp, sName):
+	sPath = os.path.join(dirTemp, sName)
+	shutil.copyfile(os.path.join(dirRepo, wcx.sqlDBname), sPath)
+	return sPath
+
+# Function to Load Tables with Parameterized Statements in One Transaction
+def load_bulk(sPath, gisData, apiData):
+	conn = sql.connect(sPath)
+	c = conn.cursor()
+	tStart = time.time()
+	conn.execute("BEGIN")
+	c.execute("DELETE FROM gisdata")
+	c.execute("DELETE FROM disruptions")
+	c.executemany(wcx.sqlInsGisdata, wcx.gisdata_rows(gisData))
+	c.executemany(wcx.sqlInsDisruptions, wcx.disruptions_rows(apiData))
+	conn.commit()
+	tElapsed = time.time() - tStart
+	conn.close()
+	return tElapsed
+
+# Function to Load Tables with Original Per-Row String SQL and Commits
+def load_legacy(sPath, gisData, apiData):
+	conn = sql.connect(sPath)
+	c = conn.cursor()
+	tStart = time.time()
+	c.execute("DELETE FROM gisdata")
+	c.execute("DELETE FROM disruptions")
+	conn.commit()
+	for incident in gisData['features']:
+		sSQL = "INSERT INTO gisdata VALUES ("
+		sSQL += str(incident["id"]) + ","
+		sSQL += "'" + coord_to_poly(incident["geometry"]["coordinates"]) + "',"
+		sSQL += "'" + incident["properties"]["Street"] + "',"
+		sSQL += str(incident["properties"]["StartDate"] / 1000) + ","
+		sSQL += str(incident["properties"]["EndDate"] / 1000) + ")"
+		c.execute(sSQL)
+		conn.commit()
+	for incident in apiData['Ongoing']:
+		sSQL = "INSERT INTO disruptions VALUES ("
+		sSQL += str(incident["Id"]) + ","
+		sSQL += "'" + wcx.chk_description(incident["WorkTypes"]) + "',"
+		sSQL += "'" + wcx.chk_short_description(incident["Impacts"]) + "',"
+		sSQL += "'" + wcx.chk_type(incident["RoadClosed"]) + "')"
+		c.execute(sSQL)
+		conn.commit()
+	tElapsed = time.time() - tStart
+	conn.close()
+	return tElapsed
+
+# Function to Print Benchmark Result
+def report(sLabel, n, tElapsed):
+	print("%-24s %8d features  %8.3f s  %10.0f features/s" % (sLabel, n, tElapsed, n / tElapsed))
+	return
+
+# NAMESPACE CALL (DO NOT MODIFY)
+# ------------------------------
+if __name__ == "__main__":
+	main()
+
+
+# ##########################################################################################################
+# END OF SCRIPT
+# ##########################################################################################################
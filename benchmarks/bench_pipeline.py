@@ -0,0 +1,228 @@
+# ##########################################################################################################
+# RENEW LONDON CIFS PIPELINE SCALING BENCHMARK
+# Created on 2026-10-17
+# Property of JK Enterprises
+# v1.1.0b
+# ##########################################################################################################
+#
+# Version History:
+# ----------------
+# 2026-10-17 v1.1.0b
+#   - Initial Version.
+#
+# Usage:
+# ------
+#
+# Runs every pipeline stage offline on synthetic payloads from 'synthetic.py' at several feed sizes, against
+# a temporary copy of the shipped 'renewlondon.db', and reports per-stage wall time, throughput and peak RSS:
+#   fetch        - JSON decode of GIS and disruptions payloads (network excluded)
+#   load         - 'parse_source()': normalize, sync tables, reconcile checksums and join
+#   incidents    - 'query_incidents()': final join and 'create_incidents()'
+#   render       - 'generate_cifs_xml()' with an empty fragment cache
+#   validate     - 'validate_xml()' (in-process schema, or xmllint without lxml)
+#   xmllint      - external 'xmllint --schema' run, when installed
+#   publish      - 'publish_sidecars()', 'publish_xml()' and 'publish_manifest()'
+#   churn_load   - 'parse_source()' after one update's churn, as derived from 'traffic-incidents.xml'
+#   churn_render - 'generate_cifs_xml()' reusing cached fragments after churn
+#
+# Each size runs in its own process so peak RSS is not carried over between sizes. Results are written as JSON.
+# Given a baseline results file, stages slower than the baseline by more than the threshold are listed and
+# the script exits non-zero, so regressions are caught before deploy.
+#
+# Instructions:
+# -------------
+# Run from the repository root:
+#
+#   python3 benchmarks/bench_pipeline.py --sizes 100 1000 10000 100000 --output bench_pipeline.json
+#   python3 benchmarks/bench_pipeline.py --baseline bench_pipeline.json --threshold 0.25
+#
+
+# ##########################################################################################################
+# MODULES AND DEFINITIONS
+# ##########################################################################################################
+
+# STANDARD MODULES
+# ----------------
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import sqlite3 as sql
+import subprocess
+import sys
+import tempfile
+import time
+
+# CUSTOM MODULES
+# --------------
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import synthetic
+import waze_cifs_xml as wcx
+
+# GLOBAL VARIABLE DEFINITIONS
+# ---------------------------
+
+dirRepo = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..") # Repository Root
+lSizes = [100, 1000, 10000, 100000] # Default Synthetic Feed Sizes (incidents)
+secMinStage = 0.005 # Stages Faster Than This Are Not Flagged as Regressions (timer noise)
+
+
+# ##########################################################################################################
+# MAIN PROGRAM
+# ##########################################################################################################
+
+# Function to Handle Main Program
+def main():
+	args = argparse.ArgumentParser(description="Benchmark the CIFS pipeline stages on synthetic payloads.")
+	args.add_argument("--sizes", nargs="+", type=int, default=lSizes, help="feed sizes in incidents (default 100 1000 10000 100000)")
+	args.add_argument("--output", default="bench_pipeline.json", help="results file (default bench_pipeline.json)")
+	args.add_argument("--baseline", help="earlier results file to check for regressions")
+	args.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown against baseline (default 0.25)")
+	args.add_argument("--worker", type=int, help=argparse.SUPPRESS) # Internal: run one size, print JSON
+	opts = args.parse_args()
+
+	if opts.worker:
+		print(json.dumps(run_size(opts.worker)))
+		return
+
+	dProfile = synthetic.load_profile()
+	dResults = {
+		"created": int(time.time()),
+		"python": platform.python_version(),
+		"sqlite": sql.sqlite_version,
+		"profile": {"vertices": dProfile["vertices"], "closed": dProfile["closed"], "churn_new": dProfile["churn_new"], "churn_changed": dProfile["churn_changed"]},
+		"sizes": {}
+		}
+	print("%-8s %-13s %10s %14s %12s" % ("size", "stage", "seconds", "incidents/s", "peak RSS MB"))
+	for n in opts.sizes:
+		sOut = subprocess.check_output([sys.executable, os.path.abspath(__file__), "--worker", str(n)])
+		dSize = json.loads(sOut.decode("utf-8").splitlines()[-1])
+		dResults["sizes"][str(n)] = dSize
+		for sStage, dStage in dSize["stages"].items():
+			print("%-8d %-13s %10.3f %14.0f %12.1f" % (n, sStage, dStage["seconds"], dStage["per_second"], dStage["peak_rss_kb"] / 1024.0))
+		print("%-8d %-13s %10d bytes" % (n, "feed", dSize["feed_bytes"]))
+	with open(opts.output, "w") as fh:
+		json.dump(dResults, fh, indent=2)
+	print("Results written to " + opts.output)
+
+	if opts.baseline:
+		with open(opts.baseline) as fh:
+			lRegressions = compare_results(json.load(fh), dResults, opts.threshold)
+		for sRegression in lRegressions:
+			print("REGRESSION: " + sRegression)
+		if lRegressions:
+			sys.exit(1)
+	return
+
+
+# ##########################################################################################################
+# DEFINED FUNCTIONS
+# ##########################################################################################################
+
+# Function to List Stages Slower Than Baseline by More Than Threshold
+def compare_results(dBaseline, dResults, fThreshold):
+	lRegressions = []
+	for sSize, dSize in dResults["sizes"].items():
+		dBase = dBaseline.get("sizes", {}).get(sSize)
+		if not dBase:
+			continue
+		for sStage, dStage in dSize["stages"].items():
+			secBase = dBase["stages"].get(sStage, {}).get("seconds")
+			if secBase is None or dStage["seconds"] < secMinStage:
+				continue
+			if dStage["seconds"] > secBase * (1 + fThreshold):
+				lRegressions.append("%s incidents, %s %.3f s vs baseline %.3f s (+%.0f%%)" % (sSize, sStage, dStage["seconds"], secBase, (dStage["seconds"] / secBase - 1) * 100))
+	return lRegressions
+
+# Function to Read Peak Resident Set Size of This Process (KB)
+def peak_rss_kb():
+	try:
+		with open("/proc/self/status") as fh:
+			for line in fh:
+				if line.startswith("VmHWM:"):
+					return int(line.split()[1])
+	except IOError:
+		pass
+	import resource # Not available on Windows
+	iPeak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	return iPeak // 1024 if sys.platform == "darwin" else iPeak # Bytes on macOS, KB elsewhere
+
+# Function to Publish Feed in Generator Order (sidecars, feed swap, manifest)
+def publish_feed(dIncidents):
+	dManifest = wcx.publish_sidecars(wcx.feed_digest(dIncidents), len(dIncidents["incident"]))
+	wcx.publish_xml()
+	wcx.publish_manifest(dManifest)
+	return
+
+# Function to Reset Peak Resident Set Size so Each Stage Reports Its Own (Linux only, else cumulative)
+def reset_peak_rss():
+	try:
+		with open("/proc/self/clear_refs", "w") as fh:
+			fh.write("5")
+	except IOError:
+		pass
+	return
+
+# Function to Run All Stages for One Feed Size in a Temporary Working Directory
+def run_size(n):
+	dProfile = synthetic.load_profile()
+	gisData, apiData = synthetic.make_payloads(n, dProfile)
+	gisNext, apiNext = synthetic.churn_payloads(gisData, apiData, dProfile)
+	bPayload = json.dumps(gisData).encode("utf-8"), json.dumps(apiData).encode("utf-8")
+	del gisData, apiData
+
+	dirTemp = tempfile.mkdtemp()
+	try:
+		for sName in (wcx.sqlDBname, wcx.fCIFSschema):
+			shutil.copyfile(os.path.join(dirRepo, sName), os.path.join(dirTemp, sName))
+		os.mkdir(os.path.join(dirTemp, "public"))
+		wcx.dirSource = dirTemp + os.sep
+		wcx.dirDest = os.path.join(dirTemp, "public") + os.sep
+		wcx.fMsgLog = os.devnull
+		wcx.curUnixTime = dProfile["timestamp"]
+		sPath = wcx.dirSource + wcx.fCIFSxml
+		wcx.get_db() # Migrate database copy before timing
+		dStages = {}
+		with open(os.devnull, "w") as fhNull, contextlib.redirect_stdout(fhNull): # Keep pipeline messages out of JSON
+			rawData = time_stage(dStages, "fetch", n, lambda: [json.loads(bData.decode("utf-8")) for bData in bPayload])
+			time_stage(dStages, "load", n, lambda: wcx.parse_source(*wcx.normalize_renewlondon(rawData)))
+			dIncidents = time_stage(dStages, "incidents", n, wcx.query_incidents)
+			time_stage(dStages, "render", n, lambda: wcx.generate_cifs_xml(dIncidents))
+			lErrors = time_stage(dStages, "validate", n, lambda: wcx.validate_xml(sPath))
+			assert not lErrors, "Synthetic feed of " + str(n) + " incidents failed validation: " + str(lErrors[:3])
+			if shutil.which("xmllint"):
+				iExit = time_stage(dStages, "xmllint", n, lambda: subprocess.call(["xmllint", "--noout", "--schema", wcx.dirSource + wcx.fCIFSschema, sPath], stderr=subprocess.DEVNULL))
+				assert iExit == 0, "Synthetic feed of " + str(n) + " incidents failed xmllint (exit " + str(iExit) + ")"
+			time_stage(dStages, "publish", n, lambda: publish_feed(dIncidents))
+			wcx.curUnixTime += wcx.secIntervalStart
+			dNext = time_stage(dStages, "churn_load", n, lambda: wcx.parse_source(*wcx.normalize_renewlondon((gisNext, apiNext))))
+			time_stage(dStages, "churn_render", n, lambda: wcx.generate_cifs_xml(dNext))
+		dSize = {"stages": dStages, "feed_bytes": os.path.getsize(sPath), "churn": dict(wcx.dRunChurn)}
+		wcx.get_db().close()
+	finally:
+		shutil.rmtree(dirTemp)
+	return dSize
+
+# Function to Time One Stage, Recording Wall Time, Throughput and Peak RSS
+def time_stage(dStages, sStage, n, fn):
+	reset_peak_rss()
+	tStart = time.perf_counter()
+	result = fn()
+	secStage = time.perf_counter() - tStart
+	dStages[sStage] = {"seconds": secStage, "per_second": n / secStage if secStage else 0.0, "peak_rss_kb": peak_rss_kb()}
+	return result
+
+# NAMESPACE CALL (DO NOT MODIFY)
+# ------------------------------
+if __name__ == "__main__":
+	main()
+
+
+# ##########################################################################################################
+# END OF SCRIPT
+# ##########################################################################################################
@@ -0,0 +1,137 @@
+# ##########################################################################################################
+# RENEW LONDON SPATIAL QUERY BENCHMARK
+# Created on 2026-10-17
+# Property of JK Enterprises
+# v1.1.0b
+# ##########################################################################################################
+#
+# Version History:
+# ----------------
+# 2026-10-17 v1.1.0b
+#   - Initial Version.
+#
+# Usage:
+# ------
+#
+# Compares 'query_bbox()' and 'query_near()' answered through the 'gisdata_rtree' bounding box index against
+# the same queries answered by a linear scan of 'gisdata' ('bSpatialIndex' off). Both use the same exact
+# geometry refinement, so results are identical and only candidate selection differs. Synthetic incidents from
+# 'synthetic.py' are spread over the City of London extent and loaded into a temporary copy of the shipped
+# 'renewlondon.db'.
+#
+# Instructions:
+# -------------
+# Run from the repository root:
+#
+#   python3 benchmarks/bench_spatial.py -n 100000 -q 20
+#
+
+# ##########################################################################################################
+# MODULES AND DEFINITIONS
+# ##########################################################################################################
+
+# STANDARD MODULES
+# ----------------
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+# CUSTOM MODULES
+# --------------
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import synthetic
+import waze_cifs_xml as wcx
+
+# GLOBAL VARIABLE DEFINITIONS
+# ---------------------------
+
+dirRepo = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..") # Repository Root
+
+
+# ##########################################################################################################
+# MAIN PROGRAM
+# ##########################################################################################################
+
+# Function to Handle Main Program
+def main():
+	args = argparse.ArgumentParser(description="Benchmark R-tree spatial queries against a linear scan.")
+	args.add_argument("-n", type=int, default=100000, help="number of synthetic incidents (default 100000)")
+	args.add_argument("-q", type=int, default=20, help="number of queries of each kind (default 20)")
+	opts = args.parse_args()
+
+	dirTemp = tempfile.mkdtemp()
+	try:
+		shutil.copyfile(os.path.join(dirRepo, wcx.sqlDBname), os.path.join(dirTemp, wcx.sqlDBname))
+		wcx.dirSource = dirTemp + os.sep
+		wcx.fMsgLog = os.devnull
+		report("load and index", opts.n, "incidents", load_features(opts.n))
+		lBoxes, lPoints = make_queries(opts.q)
+		for bIndex in (True, False):
+			wcx.bSpatialIndex = bIndex
+			sMode = "r-tree" if bIndex else "linear scan"
+			tElapsed, nFound = time_queries(lambda: [wcx.query_bbox(*box) for box in lBoxes])
+			report(sMode + " bbox", len(lBoxes), "queries", tElapsed, nFound)
+			tElapsed, nFound = time_queries(lambda: [wcx.query_near(*point) for point in lPoints])
+			report(sMode + " near 250 m", len(lPoints), "queries", tElapsed, nFound)
+		wcx.get_db().close()
+	finally:
+		shutil.rmtree(dirTemp)
+	return
+
+
+# ##########################################################################################################
+# DEFINED FUNCTIONS
+# ##########################################################################################################
+
+# Function to Load Synthetic Incident Geometry and Bounding Box Index in One Transaction
+def load_features(n):
+	gisData = synthetic.make_payloads(n, synthetic.load_profile())[0]
+	conn = wcx.get_db() # Migrates copy to current schema
+	c = conn.cursor()
+	tStart = time.time()
+	conn.execute("BEGIN")
+	c.execute("DELETE FROM gisdata")
+	lRows = list(wcx.gisdata_rows(gisData))
+	c.executemany(wcx.sqlInsGisdata, lRows)
+	wcx.index_geometry(c, lRows, None)
+	conn.commit()
+	return time.time() - tStart
+
+# Function to Generate Ward-Sized Query Boxes and Query Points
+def make_queries(q):
+	rng = random.Random(7)
+	lBoxes, lPoints = [], []
+	for i in range(q):
+		lat, lon = 42.98 + rng.uniform(-0.07, 0.07), -81.25 + rng.uniform(-0.11, 0.11)
+		lBoxes.append((lat, lon, lat + 0.01, lon + 0.015)) # About 1.1 km x 1.2 km
+		lPoints.append((lat, lon, 250))
+	return lBoxes, lPoints
+
+# Function to Print Benchmark Result
+def report(sLabel, n, sUnit, tElapsed, nFound=None):
+	sFound = "" if nFound is None else "  %8d hits" % nFound
+	print("%-22s %8d %-9s %8.3f s  %10.1f %s/s%s" % (sLabel, n, sUnit, tElapsed, n / tElapsed, sUnit, sFound))
+	return
+
+# Function to Time Batch of Queries and Count Results
+def time_queries(fn):
+	tStart = time.time()
+	lResults = fn()
+	return time.time() - tStart, sum(len(result) for result in lResults)
+
+# NAMESPACE CALL (DO NOT MODIFY)
+# ------------------------------
+if __name__ == "__main__":
+	main()
+
+
+# ##########################################################################################################
+# END OF SCRIPT
+# ##########################################################################################################
@@ -0,0 +1,114 @@
+# ##########################################################################################################
+# CIFS TIMESTAMP FORMATTING MICROBENCHMARK
+# Created on 2026-10-17
+# Property of JK Enterprises
+# v1.1.0b
+# ##########################################################################################################
+#
+# Version History:
+# ----------------
+# 2026-10-17 v1.1.0b
+#   - Initial Version.
+#
+# Usage:
+# ------
+#
+# Compares the original 'datetime_in_iso()' (strftime then 'dateutil' re-parse, fixed offset) against the
+# memoized per-value formatter, called per value and through the column helper 'datetimes_in_iso()' used by
+# 'create_incidents()', each with cold and warm memo cache. The synthetic column mimics incident data: four
+# timestamps per incident, with creation/update times heavily repeated.
+#
+# Instructions:
+# -------------
+# Run from the repository root:
+#
+#   python3 benchmarks/bench_timestamps.py -n 100000
+#
+
+# ##########################################################################################################
+# MODULES AND DEFINITIONS
+# ##########################################################################################################
+
+# STANDARD MODULES
+# ----------------
+
+from datetime import *
+import argparse
+import os
+import random
+import sys
+import time
+
+# CUSTOM MODULES
+# --------------
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import waze_cifs_xml as wcx
+
+
+# ##########################################################################################################
+# MAIN PROGRAM
+# ##########################################################################################################
+
+# Function to Handle Main Program
+def main():
+	args = argparse.ArgumentParser(description="Benchmark CIFS timestamp formatting.")
+	args.add_argument("-n", type=int, default=100000, help="number of synthetic incidents (default 100000)")
+	opts = args.parse_args()
+
+	lTs = make_column(opts.n)
+	try:
+		import dateutil.parser # Only needed for the original implementation
+		report("original datetime_in_iso", len(lTs), time_call(lambda: [legacy_datetime_in_iso(ts) for ts in lTs]))
+	except ImportError:
+		print("original datetime_in_iso   skipped, 'dateutil' not installed")
+	wcx.format_iso.cache_clear()
+	report("memoized, cold cache", len(lTs), time_call(lambda: [wcx.datetime_in_iso(ts) for ts in lTs]))
+	report("memoized, warm cache", len(lTs), time_call(lambda: [wcx.datetime_in_iso(ts) for ts in lTs]))
+	wcx.format_iso.cache_clear()
+	report("column helper, cold cache", len(lTs), time_call(lambda: wcx.datetimes_in_iso(lTs)))
+	report("column helper, warm cache", len(lTs), time_call(lambda: wcx.datetimes_in_iso(lTs)))
+	return
+
+
+# ##########################################################################################################
+# DEFINED FUNCTIONS
+# ##########################################################################################################
+
+# Function to Format Timestamp with Original Implementation
+def legacy_datetime_in_iso(ts):
+	import dateutil.parser as parser
+	ts = parser.parse(datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S'))
+	return ts.replace(microsecond=0).isoformat() + '-0' + str(int(time.timezone / 3600)) + ':00'
+
+# Function to Generate Synthetic Timestamp Column (creation, update, start, end per incident)
+def make_column(n):
+	rng = random.Random(42)
+	lRuns = [1523000000 + 180 * k for k in range(200)] # Cron ticks at which incidents were first seen
+	lTs = []
+	for i in range(n):
+		tSeen = rng.choice(lRuns)
+		tStart = 1523000000 + 3600 * rng.randint(0, 24 * 60)
+		lTs.extend([tSeen, tSeen, tStart, tStart + 86400 * rng.randint(1, 60)])
+	return lTs
+
+# Function to Print Benchmark Result
+def report(sLabel, n, tElapsed):
+	print("%-26s %9d values  %8.3f s  %12.0f values/s" % (sLabel, n, tElapsed, n / tElapsed))
+	return
+
+# Function to Time One Call
+def time_call(fn):
+	tStart = time.time()
+	fn()
+	return time.time() - tStart
+
+# NAMESPACE CALL (DO NOT MODIFY)
+# ------------------------------
+if __name__ == "__main__":
+	main()
+
+
+# ##########################################################################################################
+# END OF SCRIPT
+# ##########################################################################################################
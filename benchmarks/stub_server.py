@@ -0,0 +1,242 @@
+# ##########################################################################################################
+# RENEW LONDON LOCAL STAND-IN SERVER
+# Created on 2026-10-17
+# Property of JK Enterprises
+# v1.1.0b
+# ##########################################################################################################
+#
+# Version History:
+# ----------------
+# 2026-10-17 v1.1.0b
+#   - Initial Version.
+#
+# Usage:
+# ------
+#
+# Serves what 'waze_cifs_xml.py' reads from the Renew London website, so the whole pipeline can run end to end
+# without the real city service:
+#   /RenewLondon                        - Main website, with 'London.Renew.Public.Map.Services.ongoingData'
+#                                         defined in an embedded script ('urlRlmain', scraped or HTTP fetched)
+#   /RenewLondon/home/GetAllDisruptions - Disruptions JSON ('apiRLdisruptions'), with ETag/Last-Modified
+#
+# Payloads come from GIS and disruptions JSON fixtures, a capture recorded with '--capture', or 'synthetic.py'
+# at any feed size. Both endpoints honour 'Accept-Encoding: gzip'. Degraded conditions are configurable:
+# response latency and jitter, a share of requests answered with HTTP 500, and a share of requests stalled
+# past the fetch deadline, applied to either or both endpoints. With '--churn-every', one update's churn is
+# applied to the payloads at that interval.
+#
+# Instructions:
+# -------------
+# Run from the repository root, then point the generator at it with '--base-url':
+#
+#   python3 benchmarks/stub_server.py --port 8080 --incidents 1000 --latency 200 --error-rate 0.1 --part api
+#   python3 waze_cifs_xml.py --base-url http://127.0.0.1:8080 run
+#
+# Or import from a benchmark script in this directory:
+#
+#   import stub_server
+#   server = stub_server.start_server(*synthetic.make_payloads(1000, dProfile), fLatency=0.2)
+#   ... server.url ..., server.churn(), server.stats
+#   server.shutdown()
+#
+
+# ##########################################################################################################
+# MODULES AND DEFINITIONS
+# ##########################################################################################################
+
+# STANDARD MODULES
+# ----------------
+
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import random
+import socketserver
+import sys
+import threading
+import time
+
+# CUSTOM MODULES
+# --------------
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import synthetic
+
+# GLOBAL VARIABLE DEFINITIONS
+# ---------------------------
+
+sPagePath = "/RenewLondon" # Main Website Path
+sApiPath = "/RenewLondon/home/GetAllDisruptions" # Disruptions API Path
+secHang = 30 # Stall of Requests Picked by Hang Rate, Past Default Fetch Deadline (seconds)
+htmlPage = """<!DOCTYPE html>
+<html>
+<head><title>Renew London</title></head>
+<body>
+<div id="map"></div>
+<script>
+var London = London || {};
+London.Renew = {Public: {Map: {Services: {}}}};
+London.Renew.Public.Map.Services.ongoingData = %s;
+</script>
+</body>
+</html>
+""" # Main Website Template, GIS Feature Collection Embedded as Script Literal
+
+
+# ##########################################################################################################
+# MAIN PROGRAM
+# ##########################################################################################################
+
+# Function to Handle Main Program
+def main():
+	args = argparse.ArgumentParser(description="Serve a local stand-in for the Renew London website and disruptions API.")
+	args.add_argument("--port", type=int, default=8080, help="port to listen on (default 8080)")
+	gData = args.add_mutually_exclusive_group()
+	gData.add_argument("--incidents", type=int, default=1000, help="synthetic feed size in incidents (default 1000)")
+	gData.add_argument("--fixture", nargs=2, metavar=("GIS_JSON", "API_JSON"), help="serve these GIS and disruptions JSON files")
+	gData.add_argument("--capture", help="serve the payloads of this capture file ('.json.gz')")
+	args.add_argument("--latency", type=float, default=0, help="response latency in milliseconds (default 0)")
+	args.add_argument("--jitter", type=float, default=0, help="uniform random latency added on top, in milliseconds (default 0)")
+	args.add_argument("--error-rate", type=float, default=0, help="share of requests answered with HTTP 500 (default 0)")
+	args.add_argument("--hang-rate", type=float, default=0, help="share of requests stalled for %d s (default 0)" % secHang)
+	args.add_argument("--part", choices=["gis", "api", "both"], default="both", help="endpoint latency and faults apply to (default both)")
+	args.add_argument("--no-etag", action="store_true", help="send no ETag or Last-Modified validators")
+	args.add_argument("--churn-every", type=float, default=0, help="apply one update's churn at this interval in seconds (default 0, never)")
+	opts = args.parse_args()
+
+	if opts.fixture:
+		lData = []
+		for sPath in opts.fixture:
+			with open(sPath) as fh:
+				lData.append(json.load(fh))
+		gisData, apiData = lData
+	elif opts.capture:
+		with gzip.open(opts.capture, "rt", encoding="utf-8") as fh:
+			gisData, apiData = json.load(fh)["data"]
+	else:
+		gisData, apiData = synthetic.make_payloads(opts.incidents, synthetic.load_profile())
+	server = start_server(gisData, apiData, opts.port, opts.latency / 1000.0, opts.jitter / 1000.0, opts.error_rate, opts.hang_rate,
+		["gis", "api"] if opts.part == "both" else [opts.part], not opts.no_etag)
+	print("Serving " + str(len(gisData["features"])) + " incidents at " + server.url + sPagePath + " and " + server.url + sApiPath)
+	print("Run: python3 waze_cifs_xml.py --base-url " + server.url + " run")
+	try:
+		while True:
+			time.sleep(opts.churn_every or 3600)
+			if opts.churn_every:
+				server.churn()
+	except KeyboardInterrupt:
+		pass
+	server.shutdown()
+	return
+
+
+# ##########################################################################################################
+# DEFINED FUNCTIONS
+# ##########################################################################################################
+
+# Class of Threaded Stand-In Server Holding Current Payloads, Fault Settings and Request Counters
+class StubServer(socketserver.ThreadingMixIn, HTTPServer):
+	daemon_threads = True
+	allow_reuse_address = True
+
+	# Function to Replace Served Payloads, Prerendering Plain and Gzipped Bodies
+	def set_payloads(self, gisData, apiData):
+		self.gisData, self.apiData = gisData, apiData
+		dBodies = {}
+		for sPart, sType, bBody in (
+			("gis", "text/html; charset=utf-8", (htmlPage % json.dumps(gisData)).encode("utf-8")),
+			("api", "application/json; charset=utf-8", json.dumps(apiData).encode("utf-8"))
+			):
+			dBodies[sPart] = {
+				"type": sType,
+				"body": bBody,
+				"gzip": gzip.compress(bBody, 6),
+				"etag": '"' + hashlib.sha1(bBody).hexdigest() + '"',
+				"modified": formatdate(time.time(), usegmt=True)
+				}
+		self.bodies = dBodies # Swapped in one assignment, so requests in flight see old or new payloads whole
+		return
+
+	# Function to Apply One Update's Churn to Served Payloads
+	def churn(self):
+		self.iChurn += 1
+		self.set_payloads(*synthetic.churn_payloads(self.gisData, self.apiData, self.profile, self.iChurn))
+		return
+
+# Class of Request Handler Serving Main Website and Disruptions API with Configured Faults
+class StubHandler(BaseHTTPRequestHandler):
+
+	# Function to Silence Per-Request Logging
+	def log_message(self, sFormat, *args):
+		return
+
+	# Function to Answer GET Request
+	def do_GET(self):
+		server = self.server
+		sPath = self.path.split("?")[0].rstrip("/")
+		sPart = {sPagePath: "gis", sApiPath: "api"}.get(sPath)
+		if sPart is None:
+			self.send_error(404)
+			return
+		dStats = server.stats[sPart]
+		dStats["requests"] += 1
+		if sPart in server.lParts:
+			if server.rng.random() < server.fHangRate:
+				dStats["hangs"] += 1
+				time.sleep(secHang)
+			secDelay = server.fLatency + server.rng.uniform(0, server.fJitter)
+			if secDelay > 0:
+				time.sleep(secDelay)
+			if server.rng.random() < server.fErrorRate:
+				dStats["errors"] += 1
+				self.send_error(500)
+				return
+		dBody = server.bodies[sPart]
+		if server.bValidators and self.headers.get("If-None-Match") == dBody["etag"]:
+			dStats["not_modified"] += 1
+			self.send_response(304)
+			self.send_header("ETag", dBody["etag"])
+			self.end_headers()
+			return
+		bGzip = "gzip" in (self.headers.get("Accept-Encoding") or "")
+		bBody = dBody["gzip"] if bGzip else dBody["body"]
+		dStats["bytes"] += len(bBody)
+		self.send_response(200)
+		self.send_header("Content-Type", dBody["type"])
+		self.send_header("Content-Length", str(len(bBody)))
+		if bGzip:
+			self.send_header("Content-Encoding", "gzip")
+		if server.bValidators:
+			self.send_header("ETag", dBody["etag"])
+			self.send_header("Last-Modified", dBody["modified"])
+		self.end_headers()
+		self.wfile.write(bBody)
+		return
+
+# Function to Start Stand-In Server on Background Thread (port 0 picks a free port)
+def start_server(gisData, apiData, iPort=0, fLatency=0, fJitter=0, fErrorRate=0, fHangRate=0, lParts=None, bValidators=True, iSeed=42):
+	server = StubServer(("127.0.0.1", iPort), StubHandler)
+	server.fLatency, server.fJitter, server.fErrorRate, server.fHangRate = fLatency, fJitter, fErrorRate, fHangRate
+	server.lParts = lParts if lParts is not None else ["gis", "api"]
+	server.bValidators = bValidators
+	server.rng = random.Random(iSeed)
+	server.profile, server.iChurn = synthetic.load_profile(), 0
+	server.stats = dict((sPart, {"requests": 0, "errors": 0, "hangs": 0, "not_modified": 0, "bytes": 0}) for sPart in ("gis", "api"))
+	server.url = "http://127.0.0.1:" + str(server.server_address[1])
+	server.set_payloads(gisData, apiData)
+	threading.Thread(target=server.serve_forever, daemon=True).start()
+	return server
+
+# NAMESPACE CALL (DO NOT MODIFY)
+# ------------------------------
+if __name__ == "__main__":
+	main()
+
+
+# ##########################################################################################################
+# END OF SCRIPT
+# ##########################################################################################################
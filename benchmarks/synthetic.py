@@ -0,0 +1,151 @@
+# ##########################################################################################################
+# RENEW LONDON SYNTHETIC PAYLOAD GENERATOR
+# Created on 2026-10-17
+# Property of JK Enterprises
+# v1.1.0b
+# ##########################################################################################################
+#
+# Version History:
+# ----------------
+# 2026-10-17 v1.1.0b
+#   - Initial Version.
+#
+# Usage:
+# ------
+#
+# Shared by the benchmark scripts. Emits Renew London-shaped 'gisData' (GeoJSON feature collection as scraped
+# from the main website) and 'apiData' ('GetAllDisruptions' JSON) payloads of any size. The profile is derived
+# from the shipped sample feed 'traffic-incidents.xml':
+#   - Polylines are sample polylines (real vertex counts and shapes) moved to random points in the city
+#   - Streets, descriptions, closure share and incident durations are drawn from the sample
+#   - Churn per update is the share of sample incidents created or updated in the day before the feed timestamp
+#
+# Instructions:
+# -------------
+# Import from a benchmark script in this directory:
+#
+#   import synthetic
+#   dProfile = synthetic.load_profile()
+#   gisData, apiData = synthetic.make_payloads(10000, dProfile)
+#   gisNext, apiNext = synthetic.churn_payloads(gisData, apiData, dProfile)
+#
+
+# ##########################################################################################################
+# MODULES AND DEFINITIONS
+# ##########################################################################################################
+
+# STANDARD MODULES
+# ----------------
+
+from datetime import *
+import os
+import random
+import xml.etree.ElementTree as ET
+
+# GLOBAL VARIABLE DEFINITIONS
+# ---------------------------
+
+dirRepo = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..") # Repository Root
+fSample = "traffic-incidents.xml" # Sample Feed the Profile Is Derived From
+tCityLat = (42.90, 43.06) # City of London Latitude Extent
+tCityLon = (-81.37, -81.13) # City of London Longitude Extent
+secChurnWindow = 86400 # Window Before Feed Timestamp Counted as Churn (seconds)
+iFirstId = 10000 # First Incident ID (five digits like the real service, schema requires at least three)
+
+
+# ##########################################################################################################
+# DEFINED FUNCTIONS
+# ##########################################################################################################
+
+# Function to Derive Payload Profile from Sample CIFS XML Feed
+def load_profile(sPath=None):
+	root = ET.parse(sPath or os.path.join(dirRepo, fSample)).getroot()
+	tsFeed = parse_iso(root.get("timestamp"))
+	dProfile = {"timestamp": tsFeed, "shapes": [], "streets": [], "descriptions": [], "durations": [], "closed": 0.0}
+	nCreated, nUpdated, lIncidents = 0, 0, root.findall("incident")
+	for incident in lIncidents:
+		lValues = [float(value) for value in incident.find("location/polyline").text.split()]
+		lat0, lon0 = lValues[0], lValues[1]
+		dProfile["shapes"].append([(lValues[i + 1] - lon0, lValues[i] - lat0) for i in range(0, len(lValues), 2)]) # [lon, lat] offsets
+		dProfile["streets"].append(incident.find("location/street").text)
+		dProfile["descriptions"].append(incident.find("description").text)
+		dProfile["durations"].append(parse_iso(incident.find("endtime").text) - parse_iso(incident.find("starttime").text))
+		dProfile["closed"] += incident.find("type").text == "ROAD_CLOSED"
+		tsCreated, tsUpdated = parse_iso(incident.find("creationtime").text), parse_iso(incident.find("updatetime").text)
+		if tsFeed - tsCreated <= secChurnWindow:
+			nCreated += 1
+		elif tsFeed - tsUpdated <= secChurnWindow:
+			nUpdated += 1
+	dProfile["closed"] /= len(lIncidents)
+	dProfile["churn_new"] = nCreated / float(len(lIncidents)) # Also removed, keeping feed size steady
+	dProfile["churn_changed"] = nUpdated / float(len(lIncidents))
+	dProfile["vertices"] = sum(len(shape) for shape in dProfile["shapes"]) / float(len(lIncidents))
+	return dProfile
+
+# Function to Generate GIS and Disruptions Payloads of n Incidents
+def make_payloads(n, dProfile, iSeed=42, iFirstId=iFirstId):
+	rng = random.Random(iSeed)
+	lFeatures, lOngoing = [], []
+	for i in range(n):
+		feature, ongoing = make_incident(rng, dProfile, iFirstId + i)
+		lFeatures.append(feature)
+		lOngoing.append(ongoing)
+	return {"type": "FeatureCollection", "features": lFeatures}, {"Ongoing": lOngoing}
+
+# Function to Apply One Update's Churn (new, changed and removed incidents) to Payloads
+def churn_payloads(gisData, apiData, dProfile, iSeed=7):
+	rng = random.Random(iSeed)
+	n = len(gisData["features"])
+	nNew = int(round(n * dProfile["churn_new"]))
+	setRemoved = set(rng.sample(range(n), nNew))
+	setChanged = set(rng.sample([i for i in range(n) if i not in setRemoved], int(round(n * dProfile["churn_changed"]))))
+	lFeatures, lOngoing = [], []
+	for i in range(n):
+		if i in setRemoved:
+			continue
+		feature, ongoing = gisData["features"][i], apiData["Ongoing"][i]
+		if i in setChanged: # Extended end date and new impacts, as seen in sample updates
+			feature = dict(feature, properties=dict(feature["properties"], EndDate=feature["properties"]["EndDate"] + 7 * 86400000))
+			ongoing = dict(ongoing, Impacts=rng.choice(dProfile["descriptions"]))
+		lFeatures.append(feature)
+		lOngoing.append(ongoing)
+	iNextId = max(feature["id"] for feature in gisData["features"]) + 1
+	for i in range(nNew):
+		feature, ongoing = make_incident(rng, dProfile, iNextId + i)
+		lFeatures.append(feature)
+		lOngoing.append(ongoing)
+	return {"type": "FeatureCollection", "features": lFeatures}, {"Ongoing": lOngoing}
+
+# Function to Generate One GIS Feature and Matching Disruption
+def make_incident(rng, dProfile, iId):
+	lat, lon = rng.uniform(*tCityLat), rng.uniform(*tCityLon)
+	tsStart = dProfile["timestamp"] - rng.randint(0, 30) * 86400
+	feature = {
+		"type": "Feature",
+		"id": iId,
+		"geometry": {"type": "LineString", "coordinates": [[lon + dx, lat + dy] for dx, dy in rng.choice(dProfile["shapes"])]},
+		"properties": {
+			"Street": rng.choice(dProfile["streets"]),
+			"StartDate": tsStart * 1000,
+			"EndDate": (tsStart + rng.choice(dProfile["durations"])) * 1000
+			}
+		}
+	ongoing = {
+		"Id": iId,
+		"WorkTypes": rng.choice(dProfile["descriptions"] + [None]), # Missing values exercise defaults
+		"Impacts": rng.choice(dProfile["descriptions"] + [None]),
+		"RoadClosed": rng.random() < dProfile["closed"]
+		}
+	return feature, ongoing
+
+# Function to Parse RFC 3339 Timestamp to Unix Time (Python 3.5 compatible)
+def parse_iso(sValue):
+	ts = datetime.strptime(sValue[:19], "%Y-%m-%dT%H:%M:%S")
+	sSign, iHours, iMinutes = sValue[19], int(sValue[20:22]), int(sValue[23:25])
+	secOffset = (iHours * 3600 + iMinutes * 60) * (1 if sSign == "+" else -1)
+	return int((ts - datetime(1970, 1, 1)).total_seconds()) - secOffset
+
+
+# ##########################################################################################################
+# END OF SCRIPT
+# ##########################################################################################################
@@ -0,0 +1,195 @@
+# ##########################################################################################################
+# RENEW LONDON GIS SCRAPER DAEMON (WARM BROWSER SESSION)
+# Created on 2026-10-17
+# Property of JK Enterprises
+# v1.1.0b
+# ##########################################################################################################
+#
+# Version History:
+# ----------------
+# 2026-10-17 v1.1.0b
+#   - Initial Version.
+#
+# Usage:
+# ------
+#
+# Keeps one virtual display and headless Chrome/WebDriver session warm between CIFS XML generator runs and
+# reloads the Renew London main website on demand. 'waze_cifs_xml.py' talks to this daemon over a local Unix
+# socket when 'gisFetchMode' is set to "daemon".
+#
+# One command is accepted per connection, terminated by a newline, and answered with one JSON object:
+#   SCRAPE  - Reload main website and return {"status": "ok", "data": <GIS feature collection>}
+#   HEALTH  - Probe browser session (recycling it if unresponsive), return status, age and counters
+#   RECYCLE - Restart browser session in place
+#
+# A broken page load or failed health check recycles the browser session instead of rebooting the server.
+#
+# Instructions:
+# -------------
+# Run as a long-lived service (e.g. systemd unit or '@reboot' crontab entry) from the same directory as
+# 'waze_cifs_xml.py':
+#
+#   python3 gis_scraper.py
+#
+
+# ##########################################################################################################
+# MODULES AND DEFINITIONS
+# ##########################################################################################################
+
+# STANDARD MODULES
+# ----------------
+
+import json
+import os
+import socketserver
+import time
+
+# CUSTOM MODULES
+# --------------
+
+import waze_cifs_xml as wcx
+
+# GLOBAL VARIABLE DEFINITIONS
+# ---------------------------
+
+# Control Variables
+secHealthCheck = 60 # Idle Interval Between Browser Health Checks (seconds)
+nRecycleScrapes = 500 # Recycle Browser After This Many Scrapes to Bound Memory Growth
+
+# Browser Session State
+dSession = {"display": None, "driver": None, "started": 0, "scrapes": 0, "failures": 0, "recycles": 0}
+
+
+# ##########################################################################################################
+# MAIN PROGRAM
+# ##########################################################################################################
+
+# Function to Handle Main Program
+def main():
+	if os.path.exists(wcx.sockScraper):
+		os.remove(wcx.sockScraper) # Remove stale socket from previous run
+	start_session()
+	server = socketserver.UnixStreamServer(wcx.sockScraper, ScraperHandler)
+	server.timeout = secHealthCheck # Wake periodically to check browser health while idle
+	server.handle_timeout = health_check
+	print("GIS scraper daemon listening on " + wcx.sockScraper)
+	try:
+		while True:
+			try:
+				server.handle_request() # One request at a time keeps browser access serialized
+			except Exception as exc:
+				wcx.msg_log(int(time.time()), "ERROR: GIS scraper daemon request failed (" + str(exc) + ")!!")
+	finally:
+		server.server_close()
+		stop_session()
+		os.remove(wcx.sockScraper)
+	return
+
+
+# ##########################################################################################################
+# DEFINED FUNCTIONS
+# ##########################################################################################################
+
+# MODULE FUNCTIONS
+# ----------------
+
+# Class to Handle One Socket Command
+class ScraperHandler(socketserver.StreamRequestHandler):
+	def handle(self):
+		command = self.rfile.readline().decode('utf-8').strip().upper()
+		if command == "SCRAPE":
+			dReply = scrape()
+		elif command == "HEALTH":
+			dReply = session_status(health_check())
+		elif command == "RECYCLE":
+			try:
+				recycle_session("recycle requested")
+			except Exception:
+				pass # Reported by status below
+			dReply = session_status(probe_session())
+		else:
+			dReply = {"status": "error", "error": "unknown command " + command}
+		self.wfile.write(json.dumps(dReply).encode('utf-8'))
+		return
+
+# Function to Check Browser Session Health and Recycle if Unresponsive, Returning Whether a Session Is Alive
+def health_check():
+	if probe_session():
+		return True
+	try:
+		recycle_session("health check failed")
+	except Exception:
+		return False # Browser could not be restarted
+	return probe_session()
+
+# Function to Probe Browser Session with 'document.readyState'
+def probe_session():
+	try:
+		dSession["driver"].execute_script("return document.readyState")
+		return True
+	except Exception:
+		return False # Unresponsive or no session
+
+# Function to Recycle Browser Session in Place
+def recycle_session(reason):
+	msg = "WARNING: GIS scraper browser session recycled, " + reason + "!!"
+	print(msg)
+	wcx.msg_log(int(time.time()), msg)
+	dSession["recycles"] += 1
+	stop_session()
+	start_session()
+	return
+
+# Function to Reload Main Website and Scrape GIS Data
+def scrape():
+	if dSession["scrapes"] >= nRecycleScrapes:
+		recycle_session("scrape limit reached")
+	for attempt in range(2): # Retry once on a freshly recycled browser
+		try:
+			dSession["driver"].get(wcx.urlRlmain) # Reload main website
+			gisData = wcx.wait_for_gis(dSession["driver"])
+			dSession["scrapes"] += 1
+			return {"status": "ok", "data": gisData, "page_wait": wcx.dRunTimes["page_wait"]}
+		except Exception as exc:
+			dSession["failures"] += 1
+			recycle_session("page load failed (" + type(exc).__name__ + ")")
+	return {"status": "error", "error": "page load failed after browser recycle"}
+
+# Function to Report Browser Session Status
+def session_status(bAlive):
+	dStatus = {
+		"status": "ok" if bAlive else "error",
+		"age": time.time() - dSession["started"],
+		"scrapes": dSession["scrapes"],
+		"failures": dSession["failures"],
+		"recycles": dSession["recycles"]
+		}
+	if not bAlive:
+		dStatus["error"] = "no live browser session"
+	return dStatus
+
+# Function to Start Browser Session
+def start_session():
+	dSession["display"], dSession["driver"] = wcx.start_browser()
+	dSession["started"] = time.time()
+	dSession["scrapes"] = 0
+	return
+
+# Function to Stop Browser Session
+def stop_session():
+	try:
+		wcx.stop_browser(dSession["display"], dSession["driver"])
+	except:
+		pass # Browser already gone, nothing left to close
+	dSession["display"], dSession["driver"] = None, None
+	return
+
+# NAMESPACE CALL (DO NOT MODIFY)
+# ------------------------------
+if __name__ == "__main__":
+	main()
+
+
+# ##########################################################################################################
+# END OF SCRIPT
+# ##########################################################################################################
@@ -10,6 +10,32 @@
 # ----------------
 # 2018-04-09 v1.0.0b - JDK
 #   - Initial Version.
+# 2026-10-17 v1.1.0b
+#   - Added browser-free HTTP fetch mode for GIS data ('gisFetchMode').
+#   - Replaced fixed page load sleeps with readiness polling ('secPageWait').
+#   - Added warm browser daemon fetch mode backed by 'gis_scraper.py'.
+#   - Fetch GIS and disruptions data concurrently under one deadline ('secFetchDeadline', 'secPageLoad', 'secHttpTimeout').
+#   - Bulk load database tables with parameterized statements in one transaction per run.
+#   - Reconcile checksum table with set-based staging and upsert statements, restaging only rows written by incremental sync.
+#   - Added incremental diff-based database sync with per-run churn counts ('dbSyncMode').
+#   - Write CIFS XML in one buffered, escaped pass and publish with atomic replace ('bPublishSymlink').
+#   - Cache rendered incident XML fragments keyed by checksum and render version and settings ('bFragmentCache').
+#   - Validate CIFS XML in-process against a compiled, cached schema with per-incident errors.
+#   - Skip publish for unchanged incident sets, write '.gz'/'.br' sidecars and ETag manifest.
+#   - Added 'daemon' command with warm state, adaptive jittered schedule and per-stage deadlines.
+#   - Batch, memoized timestamp formatting with zone-correct (DST-aware) offsets ('tzName').
+#   - Split CLI into fetch/load/render/validate/publish commands with lazy heavy imports and startup report.
+#   - Quantize polyline coordinates and optionally simplify with Douglas-Peucker ('coordPrecision').
+#   - Store geometry as packed fixed-point BLOBs, formatted only at render time, with database migration.
+#   - Added R-tree bounding box index with 'query' command and 'render --bbox' ('bSpatialIndex').
+#   - Added source adapter registry with own database and feed per source, run in parallel processes ('dAdapters').
+#   - Export per-stage timings, counts, churn, output sizes and failure reasons as Prometheus textfile and JSON.
+#   - Conditional GET with on-disk response cache, skipping load of sources unchanged since last load ('bConditionalGet').
+#   - Keep source bodies in per-part cache files, written only when changed and needed by reload mode or captures.
+#   - Fall back on last-known-good source data within staleness budget, retrying failed sources in background ('secStaleBudget').
+#   - Record raw source data of each run as gzipped captures ('bCapture') and added 'replay' command for offline reruns.
+#   - Added '--base-url' to fetch from a local stand-in server ('benchmarks/stub_server.py') for end-to-end tests.
+#   - Build compact slotted 'Incident' records straight from the database row factory, interning repeated strings.
 #
 # Usage:
 # ------
@@ -26,7 +52,28 @@
 # Instructions:
 # -------------
 # Call script to query active database records and subsequently generate CIFS XML file. Initialized through
-# 'crontab -e' for production usage.
+# 'crontab -e' for production usage, or run continuously with 'python3 waze_cifs_xml.py daemon'.
+#
+# Individual stages can be run on their own, e.g. to regenerate the feed from 'renewlondon.db' only:
+#   python3 waze_cifs_xml.py fetch|load|render|validate|publish [--startup-report]
+#
+# Each source adapter in 'dAdapters' keeps its own database and CIFS XML feed. Sources listed in 'lAdapters'
+# (or chosen with '--source NAME', repeatable) run in separate processes so one slow or failing source never
+# holds back the others:
+#   python3 waze_cifs_xml.py --source renewlondon run
+#
+# Incidents can be looked up spatially, or a feed rendered for one area only:
+#   python3 waze_cifs_xml.py query --bbox MINLAT MINLON MAXLAT MAXLON | --near LAT LON [--radius METRES]
+#   python3 waze_cifs_xml.py render --bbox MINLAT MINLON MAXLAT MAXLON --output FILE
+#
+# Raw source data of each run can be recorded ('--capture' or 'bCapture') and replayed offline, without network
+# or browser, through load, render and validation against a fresh database in a scratch directory. Captures are
+# replayed as fast as possible, or at '--speed' times the pace they were recorded at:
+#   python3 waze_cifs_xml.py --capture run
+#   python3 waze_cifs_xml.py replay [CAPTURE_OR_DIR ...] [--speed FACTOR] [--workdir DIR]
+#
+# For end-to-end tests, Renew London requests can be sent to a local stand-in server instead:
+#   python3 waze_cifs_xml.py --base-url http://127.0.0.1:8080 run
 #
 # Reference:
 # ----------
@@ -39,27 +86,49 @@
 
 # STANDARD MODULES
 # ----------------
+# Heavy third-party modules (selenium, pyvirtualdisplay, urllib3, lxml, numpy) are imported lazily by the
+# stages that need them, so render-only and validate-only runs start quickly.
 
+from time import perf_counter
+tModuleStart = perf_counter() # Startup Report Reference Point
+from concurrent import futures
 from datetime import *
-from pyvirtualdisplay import Display
-from selenium import webdriver
+from html import escape
+import argparse
+import array
 import codecs
-import dateutil.parser as parser
+import contextlib
+import functools
+import gzip
 import hashlib
+import io
 import json
+import math
+import os
+import random
+import re
 import signal
+import shutil
+import socket
 import subprocess
 import sqlite3 as sql
+import sys
+import tempfile
+import threading
 import time
-import urllib3
 
 # GLOBAL VARIABLE DEFINITIONS
 # ---------------------------
 
 # URL and API Source Data
+urlRlbase = "https://apps.london.ca" # Renew London Host (replaced by '--base-url', e.g. for local stand-in server)
 urlRlmain = "https://apps.london.ca/RenewLondon" # Renew London Main URL
 apiRLdisruptions = "https://apps.london.ca/RenewLondon/home/GetAllDisruptions" # JSON object of disruptions
 apiJSobj = "return London.Renew.Public.Map.Services.ongoingData" # Access JavaScript Object
+apiJSready = "try { var d = London.Renew.Public.Map.Services.ongoingData; return (d && d.features && d.features.length > 0) ? d : null; } catch (e) { return null; }" # Access JavaScript Object Once Populated
+apiRLgis = "" # Optional JSON endpoint backing the JavaScript Object (blank to scrape embedded script payload)
+reJSobj = re.compile(r"ongoingData\s*[=:]\s*") # Locate JavaScript Object assignment in page script payload
+rawUnchanged = "UNCHANGED" # Fetch Result Marker for Source Identical to Last Loaded Payload
 XMLschema = "https://www.gstatic.com/road-incidents/incidents_feed.xsd" # Google-side XML Schema Verification
 
 # File and Directory Names
@@ -67,14 +136,142 @@ dirSource = "/var/www/apps.smartcitylondon.ca/RenewLondon/" # Source Directory
 dirDest = "/var/www/apps.smartcitylondon.ca/public_html/RenewLondon/" # Destination Directory
 fCIFSxml = "traffic-incidents.xml" # File Name for Output CIFS XML
 fCIFSschema = "incidents_feed-2.0.0.mod.xsd" # CIFS XML Schema File
+fCIFSmanifest = "traffic-incidents.manifest.json" # Published Feed Digest, ETag and Last-Modified Manifest
+dirMetrics = "/var/lib/prometheus/node-exporter/" # Prometheus Node Exporter Textfile Collector Directory
+fMetrics = "renewlondon.prom" # Prometheus Textfile Written After Each Cycle
+fRunSummary = "renewlondon-run.json" # JSON Summary of Last Cycle with Cumulative Failure Counts
+fSourceCache = "renewlondon-cache.json" # Validators, Hashes and Load Times of Last Loaded Sources (conditional GET and last-known-good cache, bodies in '-cache-<part>.json' files)
 sqlDBname = "renewlondon.db" # SQLite Database Name
+sockScraper = "/var/www/apps.smartcitylondon.ca/RenewLondon/scraper.sock" # GIS Scraper Daemon Socket
+
+# Source Adapters (functions named as strings resolve in this module, importing scripts may register callables)
+#   fetch     - Returns raw source payload (JSON-serializable, kept in snapshot file) or False on failure
+#   normalize - Converts raw payload to ('gisdata' rows, 'disruptions' rows) as in 'gisdata_rows()'/'disruptions_rows()'
+#   source    - CIFS <source> metadata stamped on every incident of the feed
+#   db, xml   - Database and feed file names (snapshot and manifest names are derived from these)
+dAdapters = {
+	"renewlondon": {
+		"fetch": "fetch_sources",
+		"normalize": "normalize_renewlondon",
+		"source": {"reference": "RenewLondon", "url": "https://apps.london.ca/RenewLondon", "name": "Corporation of the City of London"},
+		"parts": ["gis", "api"], # Raw data parts, named as in source cache
+		"db": "renewlondon.db",
+		"xml": "traffic-incidents.xml"
+		}
+	}
+lAdapters = ["renewlondon"] # Source Adapters Run by Default (in parallel processes when more than one)
+sAdapter = "renewlondon" # Source Adapter Active in This Process
+dSourceMeta = dict((key, sys.intern(value)) for key, value in dAdapters["renewlondon"]["source"].items()) # CIFS Source Metadata of Active Adapter, Shared by All Incidents
+sLogPrefix = "" # Message Log Prefix Naming Active Adapter When Several Run in Parallel
+
+# SQL Statements (Parameterized and Reused from SQLite Statement Cache)
+sqlInsGisdata = "INSERT INTO gisdata VALUES (?,?,?,?,?)" # id, polyline (packed geometry BLOB), street, starttime, endtime
+sqlInsDisruptions = "INSERT INTO disruptions VALUES (?,?,?,?)" # id, description, short_description, type
+sqlRepGisdata = "INSERT OR REPLACE INTO gisdata VALUES (?,?,?,?,?)" # Incremental sync of new/changed rows
+sqlRepDisruptions = "INSERT OR REPLACE INTO disruptions VALUES (?,?,?,?)" # Incremental sync of new/changed rows
+sqlCreateFragments = "CREATE TABLE IF NOT EXISTS fragments (id integer PRIMARY KEY, sha256 text NOT NULL, version integer NOT NULL, xml text NOT NULL)"
+sqlRepFragments = "INSERT OR REPLACE INTO fragments VALUES (?,?,?,?)" # id, sha256, version, xml
+sqlCreateRtree = "CREATE VIRTUAL TABLE IF NOT EXISTS gisdata_rtree USING rtree(id, minlat, maxlat, minlon, maxlon)" # Incident bounding boxes
+sqlRepRtree = "INSERT OR REPLACE INTO gisdata_rtree VALUES (?,?,?,?,?)" # id, minlat, maxlat, minlon, maxlon
+sqlSelRtree = ( # Candidate incidents whose bounding box overlaps query box
+	"SELECT gisdata.id, gisdata.polyline FROM gisdata_rtree INNER JOIN gisdata ON gisdata.id = gisdata_rtree.id "
+	"WHERE gisdata_rtree.maxlat >= ? AND gisdata_rtree.minlat <= ? AND gisdata_rtree.maxlon >= ? AND gisdata_rtree.minlon <= ?"
+	)
+sqlSelHashRows = ( # Joined source rows hashed into checksums, columns in 'calc_sha256_hash()' order
+	"SELECT gisdata.id, gisdata.polyline, gisdata.street, gisdata.starttime, gisdata.endtime, disruptions.description, "
+	"disruptions.short_description, disruptions.type FROM gisdata INNER JOIN disruptions ON disruptions.id = gisdata.id"
+	)
+sqlSelIncidents = ( # Joined incident records, columns in 'Incident.__slots__' order
+	"SELECT gisdata.id, checksum.sha256, checksum.creationtime, checksum.updatetime, disruptions.type, disruptions.description, "
+	"disruptions.short_description, gisdata.street, gisdata.polyline, gisdata.starttime, gisdata.endtime "
+	"FROM gisdata INNER JOIN disruptions ON disruptions.id = gisdata.id INNER JOIN checksum ON disruptions.id = checksum.id"
+	)
+sqlCreateTables = [ # Base tables for databases of newly added source adapters
+	"CREATE TABLE IF NOT EXISTS checksum (id integer NOT NULL PRIMARY KEY, accesstime integer NOT NULL, creationtime integer NOT NULL, updatetime integer NOT NULL, sha256 text NOT NULL)",
+	"CREATE TABLE IF NOT EXISTS gisdata (id integer NOT NULL PRIMARY KEY, polyline blob NOT NULL, street text NOT NULL, starttime integer NOT NULL, endtime integer NOT NULL)",
+	"CREATE TABLE IF NOT EXISTS disruptions (id integer NOT NULL PRIMARY KEY, description text NOT NULL, short_description text, type text NOT NULL)"
+	]
+sqlInsStage = "INSERT INTO stage_checksum VALUES (?,?)" # id, sha256
+sqlUpsertChecksum = ( # Requires SQLite 3.24+, writes updatetime/sha256 only when hash differs (accesstime set on insert only)
+	"INSERT INTO checksum (id, accesstime, creationtime, updatetime, sha256) "
+	"SELECT id, :now, :now, :now, sha256 FROM stage_checksum WHERE 1 "
+	"ON CONFLICT(id) DO UPDATE SET updatetime = excluded.updatetime, sha256 = excluded.sha256 "
+	"WHERE checksum.sha256 <> excluded.sha256"
+	)
+sqlUpdChecksum = ( # Fallback for older SQLite without upsert, paired with 'sqlInsNewChecksum'
+	"UPDATE checksum SET updatetime = :now, "
+	"sha256 = (SELECT s.sha256 FROM stage_checksum s WHERE s.id = checksum.id) "
+	"WHERE sha256 <> (SELECT s.sha256 FROM stage_checksum s WHERE s.id = checksum.id)"
+	)
+sqlInsNewChecksum = "INSERT OR IGNORE INTO checksum SELECT id, :now, :now, :now, sha256 FROM stage_checksum"
+sqlDelStaleChecksum = "DELETE FROM checksum WHERE id NOT IN (SELECT id FROM stage_checksum)"
+sqlDelStaleFragments = "DELETE FROM fragments WHERE id NOT IN (SELECT id FROM stage_checksum)" # Re-added incident gets new creationtime, so must re-render
+sqlSelHashRowsSynced = ( # Hash rows of ids written by incremental sync, plus any joined row still missing its checksum
+	sqlSelHashRows + " LEFT JOIN checksum ON checksum.id = gisdata.id "
+	"WHERE gisdata.id IN (SELECT id FROM stage_ids) OR checksum.id IS NULL"
+	)
 
 # Control Variables
 secSleep = 3 # Program Sleep Time (seconds)
+secPoll = 0.25 # Page Readiness Polling Interval (seconds)
+secPageWait = 20 # Page Readiness Deadline (seconds)
+secPageLoad = 15 # Browser Page Load Timeout, Below Fetch Deadline (seconds)
+secHttpTimeout = 20 # Total Timeout per Source HTTP Request, Below Fetch Deadline (seconds)
 secTimeout = 30 # Program Function Timeout (seconds)
-curUnixTime = int(time.time()) # Get Current Unix Timestamp
+secFetchDeadline = 25 # Shared Deadline for Concurrent GIS and API Fetches (seconds)
+bBrotli = False # Also Write Precompressed '.br' Sidecar (requires 'brotli' module)
+bFragmentCache = True # Reuse Rendered Incident XML Fragments for Unchanged Checksums
+bPublishSymlink = False # Publish Mode (False to atomically replace a copy, True to atomically swap a symbolic link)
+bRefreshTimestamp = False # Republish Unchanged Feed with Fresh Root Timestamp (skips validation only)
+bSpatialIndex = True # Maintain R-tree Bounding Box Index over gisdata (disabled automatically without SQLite R*Tree module)
+bSkipUnchanged = True # Skip Generation, Validation and Publish When Incident Set Digest Unchanged
+dbSyncMode = "incremental" # Database Sync Mode ("incremental" to write only changed rows, "reload" to wipe and reload)
+gisFetchMode = "selenium" # GIS Fetch Mode ("selenium" for headless browser, "http" for browser-free fetch, "daemon" for warm browser in 'gis_scraper.py')
+curUnixTime = int(time.time()) # Get Current Unix Timestamp (refreshed per cycle in daemon mode)
+dRunTimes = {} # Stage Durations Recorded During Current Run (seconds)
+dRunChurn = {} # Inserted/Changed/Removed Row Counts per Table During Current Run
+dRunStatus = {} # Outcome, First Failure Reason and Incident Counts by Type of Current Run
+bMetrics = True # Export Prometheus Textfile and JSON Run Summary After Each Cycle
+bConditionalGet = True # Send If-None-Match/If-Modified-Since and Skip Loading Sources Unchanged Since Last Load (incremental sync only)
+dSourceCache = None # Source Cache Read Once per Process
+dCachePending = {} # Source Cache Entries Committed Once Current Load Succeeds
+secStaleBudget = 1800 # Maximum Age of Last-Known-Good Data Used for a Source That Failed or Missed Fetch Deadline (seconds, 0 to disable)
+secRetryBase = 2 # First Background Retry Delay for a Failed Source, Doubled per Attempt (seconds)
+nRetries = 5 # Background Retry Attempts per Failed Source (0 to disable)
+secRetryWindow = 60 # Time a Single Run Waits on Background Retries Before Exiting (seconds)
+dRetryResults = {} # Source Data Recovered by Background Retries, Consumed by Next Fetch
+setRetrying = set() # Sources with Background Retry in Progress
+evRetry = threading.Event() # Set When a Background Retry Recovers a Source
+tlsFetch = threading.local() # Per-Thread Source Cache Entries of Fetch in Progress
+xsdSchema = None # Compiled CIFS XML Schema, Cached Across Runs in Same Process
 fMsgLog = "/var/www/apps.smartcitylondon.ca/public_html/RenewLondon/messages.html" # Message Log Text File
 
+coordScale = 10000000 # Fixed-Point Scale of Packed Geometry BLOBs (1e7 = ~1 cm, int32 range)
+coordPrecision = 6 # Polyline Coordinate Decimal Places (6 = ~0.1 m as required by schema, None for 7 = resolution of 'coordScale' fixed-point storage)
+mSimplifyTolerance = 0 # Douglas-Peucker Polyline Simplification Tolerance (metres, 0 to disable)
+nSimplifyVectorMin = 1000 # Minimum Line Vertices Worth Vectorizing Simplification with NumPy
+nLogErrors = 10 # Maximum Schema Validation Errors Logged per Run
+tzName = "America/Toronto" # IANA Time Zone for CIFS Timestamps (blank for system local time)
+xmlRenderVersion = 2 # Incident XML Render Version (bump whenever 'render_incident()' code changes, settings it reads are folded in by 'render_key()')
+
+# Daemon Scheduler Variables
+secIntervalMin = 60 # Fastest Update Interval While Incidents Are Churning (seconds)
+secIntervalMax = 900 # Slowest Update Interval While Quiet and Overnight (seconds)
+secIntervalStart = 180 # Initial Update Interval, Matching Former Crontab Schedule (seconds)
+fIntervalJitter = 0.1 # Random Jitter Applied to Each Interval (fraction)
+lNightHours = [0, 1, 2, 3, 4, 5] # Local Hours Polled at Slowest Interval
+dStageDeadlines = {"render": 15, "validate": 15, "publish": 15} # Per-Stage Deadlines After Update Stage (seconds)
+httpPool = None # Shared HTTP Connection Pool, Kept Warm Across Cycles
+lBrowsers = [] # Browser Sessions of GIS Scrapes in Progress, Torn Down When Their Fetch Misses the Deadline
+sqlConn = None # Shared SQLite Connection, Kept Warm Across Cycles
+iSchemaVersion = 2 # Database Schema Version (PRAGMA user_version), 1 = Packed Geometry BLOBs, 2 = R-tree Index
+tzLocal = None # Resolved Time Zone for CIFS Timestamps
+fSnapshot = "renewlondon-snapshot.json" # Raw Fetch Snapshot Handed from 'fetch' to 'load' Command
+bCapture = False # Record Raw Source Data of Each Run as Gzipped, Timestamped Capture (also '--capture')
+dirCapture = "captures/" # Capture Directory, Relative to 'dirSource'
+dayCaptureKeep = 7 # Days of Captures Kept (0 to keep all)
+lHeavyModules = ["selenium", "pyvirtualdisplay", "urllib3", "lxml", "numpy"] # Modules Listed in Startup Report
+
 # Default Data Values
 def_description = "Undisclosed work details" # Default Incident Description
 def_short_description = "Caution workers present" # Default Incident Short Description
@@ -86,50 +283,46 @@ def_short_description = "Caution workers present" # Default Incident Short Descr
 
 # Function to Handle Main Program
 def main():
-	# Update Incidents from Database
-	signal.signal(signal.SIGALRM, timeout) # Register the signal function handler
-	signal.alarm(secTimeout) # Set Timeout Duration
-	try:
-		dIncidents = update_db()
-		#loop_forever() # TEST CALL
-	except Exception as exc:
-		msg_log(curUnixTime, str(exc)) # Log exception message
-		return
-	signal.alarm(0) # Cancel timeout upon success
+	args = argparse.ArgumentParser(description="Generate the Renew London CIFS XML feed.")
+	args.add_argument("--startup-report", action="store_true", help="print import and run timings on exit")
+	args.add_argument("--source", action="append", choices=sorted(dAdapters), help="source adapter to run (repeatable, default from 'lAdapters')")
+	args.add_argument("--capture", action="store_true", help="record raw source data of each run to the capture directory")
+	args.add_argument("--base-url", help="fetch Renew London pages and API from this host instead, e.g. a local stand-in server")
+	cmds = args.add_subparsers(dest="command", metavar="command")
+	cmds.add_parser("run", help="fetch, load, render, validate and publish once (default, for crontab)")
+	cmds.add_parser("daemon", help="run update cycles continuously on an adaptive schedule")
+	cmds.add_parser("fetch", help="fetch GIS and disruptions data into the snapshot file")
+	cmds.add_parser("load", help="load the snapshot file into the database")
+	pRender = cmds.add_parser("render", help="render the CIFS XML file from the database")
+	pRender.add_argument("--bbox", nargs=4, type=float, metavar=("MINLAT", "MINLON", "MAXLAT", "MAXLON"), help="render only incidents intersecting this bounding box (requires '--output')")
+	pRender.add_argument("--output", help="write CIFS XML to this path instead of the working feed")
+	cmds.add_parser("validate", help="validate the CIFS XML file against the schema")
+	cmds.add_parser("publish", help="publish the CIFS XML file, sidecars and manifest")
+	pQuery = cmds.add_parser("query", help="list incidents in a bounding box or near a point")
+	gWhere = pQuery.add_mutually_exclusive_group(required=True)
+	gWhere.add_argument("--bbox", nargs=4, type=float, metavar=("MINLAT", "MINLON", "MAXLAT", "MAXLON"), help="incidents intersecting this bounding box")
+	gWhere.add_argument("--near", nargs=2, type=float, metavar=("LAT", "LON"), help="incidents within '--radius' of this point")
+	pQuery.add_argument("--radius", type=float, default=100, help="search radius for '--near' in metres (default 100)")
+	pReplay = cmds.add_parser("replay", help="replay captured source data through load, render and validate offline")
+	pReplay.add_argument("paths", nargs="*", metavar="CAPTURE_OR_DIR", help="capture files or directories (default capture directory)")
+	pReplay.add_argument("--speed", type=float, default=0, help="replay at this multiple of recorded pace (default 0, as fast as possible)")
+	pReplay.add_argument("--workdir", help="keep database and feeds in this directory instead of a temporary one")
+	opts = args.parse_args()
+	secImport = time.perf_counter() - tModuleStart
 
-	# Generate CIFS XML File
-	try:
-		generate_cifs_xml(dIncidents)
-	except:
-		msg = "ERROR: CIFS XML file failed to generate!!"
-		print(msg)
-		msg_log(curUnixTime, msg)
-		return
-
-	# Validate CIFS XML Against Local Schema
-	chkSchema = subprocess.getoutput('xmllint --schema ' + dirSource + fCIFSschema + ' --noout ' + dirSource + fCIFSxml)
-	#print(chkSchema)
-	if chkSchema != dirSource + fCIFSxml + " validates":
-		msg = "ERROR: CIFS XML file did not validate against schema!!"
-		print(msg)
-		msg_log(curUnixTime, msg)
-		return
-
-	# Link CIFS XML File to Public Folder
-	### Waze ideally recommends a symbolic link, but using direct copy given small file size.
-	chkCopy = subprocess.getoutput('cp ' + dirSource + fCIFSxml + ' ' + dirDest + fCIFSxml)
-	#print(chkCopy)
-	if not chkCopy == "":
-		msg = "ERROR: CIFS XML file did not transfer to public folder!!"
-		print(msg)
-		msg_log(curUnixTime, msg)
-		return
-
-	# Record Success Message in Log File
-	msg = "SUCCESS: Updated CIFS XML file generated!!"
-	print(msg)
-	msg_log(curUnixTime, msg)
+	lNames = opts.source or lAdapters
+	if len(lNames) == 1:
+		bOk = run_adapter(lNames[0], opts) # Run in-process, keeping single-source runs as lean as before
+	else:
+		bOk = run_adapters(lNames, opts)
 
+	if opts.startup_report:
+		print("Startup report: module import %.1f ms, total %.1f ms" % (secImport * 1000, (time.perf_counter() - tModuleStart) * 1000))
+		for sModule in lHeavyModules:
+			print("  %-18s %s" % (sModule, "loaded" if sModule in sys.modules else "not loaded"))
+		print("  (use 'python3 -X importtime waze_cifs_xml.py ...' for a per-module breakdown)")
+	if not bOk:
+		sys.exit(1)
 	return
 
 
@@ -137,197 +330,312 @@ def main():
 # DEFINED FUNCTIONS
 # ##########################################################################################################
 
+# DATA CLASSES
+# ------------
+
+# Class of One CIFS Incident Record, Built by SQLite Row Factory from 'sqlSelIncidents' Row
+class Incident(object):
+	__slots__ = (
+		"id", "sha256", "creationtime", "updatetime", "type", "description", "short_description", "street", "polyline", "starttime", "endtime",
+		"creationtime_iso", "updatetime_iso", "starttime_iso", "endtime_iso"
+		) # Database columns, then CIFS timestamps formatted in batch by 'create_incidents()'
+
+	direction = "BOTH_DIRECTIONS" # Same for every incident, kept once on class
+
+	# Function to Build Incident from Row, Interning Strings Repeated Across Incidents (timestamps formatted later in batch)
+	def __init__(self, cursor, row):
+		self.id = row[0]
+		self.sha256 = row[1]
+		self.creationtime = row[2]
+		self.updatetime = row[3]
+		self.type = sys.intern(row[4])
+		self.description = sys.intern(row[5])
+		self.short_description = sys.intern(chk_short_description(row[6])) # Nullable column, default as on load
+		self.street = sys.intern(row[7])
+		self.polyline = row[8] # Packed geometry BLOB, formatted at render time
+		self.starttime = row[9]
+		self.endtime = row[10]
+
+	# Function to Return CIFS Source Metadata, Shared by All Incidents of Active Adapter
+	@property
+	def source(self):
+		return dSourceMeta
+
 # MODULE FUNCTIONS
 # ----------------
 
-# Function to Create Incidents Dictionary
+# Function to Create Incidents Dictionary, Formatting Timestamps of All Incident Records in One Batch
 def create_incidents(lResults):
-	dIncidents = {"timestamp": datetime_in_iso(curUnixTime), "incident": []}
-	for incident in lResults:
-		dIncidents["incident"].append({
-			"id": incident[0],
-			"creationtime": datetime_in_iso(incident[11]),
-			"updatetime": datetime_in_iso(incident[12]),
-			"type": incident[8],
-			"description": incident[6],
-			"short_description": incident[7],
-			"location": {
-				"street": incident[2],
-				"polyline": incident[1],
-				"direction": "BOTH_DIRECTIONS"
-				},
-			"starttime": datetime_in_iso(incident[3]),
-			"endtime": datetime_in_iso(incident[4]),
-			"source": {
-				"reference": "RenewLondon",
-				"url": "https://apps.london.ca/RenewLondon",
-				"name": "Corporation of the City of London"
-				}
-			})
-	return dIncidents
+	lTimes = datetimes_in_iso([ts for incident in lResults for ts in (incident.creationtime, incident.updatetime, incident.starttime, incident.endtime)])
+	for i, incident in enumerate(lResults):
+		incident.creationtime_iso, incident.updatetime_iso, incident.starttime_iso, incident.endtime_iso = lTimes[4 * i:4 * i + 4]
+	return {"timestamp": datetime_in_iso(curUnixTime), "incident": lResults}
 
-# Function to Generate CIFS XML File
-def generate_cifs_xml(dIncidents):
-	# Initialize CIFS XML Headers
-	init_xml(dIncidents["timestamp"])
-	#print(dIncidents["timestamp"])
-	# Construct CIFS XML Records
-	for incident in dIncidents["incident"]:
-		xmltxt = '  <incident id="' + str(incident["id"]) + '">\n'
-		xmltxt += '    <creationtime>' + incident["creationtime"] + '</creationtime>\n'
-		xmltxt += '    <updatetime>' + incident["updatetime"] + '</updatetime>\n'
-		xmltxt += '    <source>\n'
-		xmltxt += '      <reference>' + incident["source"]["reference"] + '</reference>\n'
-		xmltxt += '      <name>' + incident["source"]["name"] + '</name>\n'
-		xmltxt += '      <url>' + incident["source"]["url"] + '?id=' + str(incident["id"]) + '</url>\n'
-		xmltxt += '    </source>\n'
-		xmltxt += '    <type>' + incident["type"] + '</type>\n'
-		xmltxt += '    <description>' + incident["short_description"] + '</description>\n' # USING SHORT DESCRIPTION DUE TO VALIDATION ERROR
-		xmltxt += '    <location>\n'
-		xmltxt += '      <street>' + incident["location"]["street"] + '</street>\n'
-		xmltxt += '      <polyline>' + incident["location"]["polyline"] + '</polyline>\n'
-		xmltxt += '      <direction>' + incident["location"]["direction"] + '</direction>\n'
-		xmltxt += '    </location>\n'
-		xmltxt += '    <starttime>' + incident["starttime"] + '</starttime>\n'
-		xmltxt += '    <endtime>' + incident["endtime"] + '</endtime>\n'
-		#xmltxt += '    <short_description>' + incident["short_description"] + '</short_description>\n'
-		xmltxt += '  </incident>\n'
-		with open(dirSource + fCIFSxml, "a") as fh:
+# Function to Fetch GIS and Disruptions Data Concurrently Under Shared Deadline, Falling Back on Last-Known-Good Data
+def fetch_sources():
+	dSources = {
+		"gis": (query_gis, "GIS data scrape"),
+		"api": (query_details, "Disruption data API query")
+		}
+	dResults = {}
+	dPending = {}
+	for name in dSources:
+		if name in dRetryResults: # Recovered by background retry since last fetch
+			dResults[name], dPending[name] = dRetryResults.pop(name)
+			msg_log(curUnixTime, "SUCCESS: " + dSources[name][1] + " recovered by background retry!!")
+	dFutures = {}
+	for name in dSources:
+		if name not in dResults:
+			dFutures[name] = submit_daemon(time_stage, name + "_fetch", fetch_source, dSources[name][0])
+	futures.wait(dFutures.values(), timeout=secFetchDeadline) # Daemon threads, so a source that missed the deadline never holds up exit
+	for name in dFutures:
+		msg = "ERROR: " + dSources[name][1] + " failed!!" # If error
+		dResults[name] = False
+		if not dFutures[name].done():
+			msg = "ERROR: " + dSources[name][1] + " missed fetch deadline!!"
+			if name == "gis":
+				stop_browsers() # Unblock hung scrape and release browser and virtual display
+		else:
+			try:
+				dResults[name], dPending[name] = dFutures[name].result()
+			except:
+				pass # Logged below as a failed source
+		if not dResults[name]:
+			start_retry(name, dSources[name][0], dFutures[name])
+			dResults[name] = fallback_source(name)
+			if dResults[name]:
+				msg = msg.replace("ERROR:", "WARNING:").rstrip("!") + ", using last-known-good data " + str(dRunStatus["stale"][name]) + " s old!!"
+			else:
+				run_failed(name + ("_fetch" if dFutures[name].done() else "_fetch_deadline"))
+			print(msg)
+			msg_log(curUnixTime, msg)
+	if not dResults["gis"] or not dResults["api"]:
+		return False
+	for name in dPending:
+		if name not in dRunStatus.get("stale", {}):
+			dCachePending.update(dPending[name]) # Only fresh data may refresh cache and load times
+	if dResults["gis"] != rawUnchanged and "gis" not in dRunStatus.get("stale", {}):
+		sBody = json.dumps(dResults["gis"], sort_keys=True)
+		sHash = hashlib.sha256(sBody.encode('utf-8')).hexdigest()
+		dEntry = load_source_cache().get("gis", {})
+		if bConditionalGet and dbSyncMode == "incremental" and sHash == dEntry.get("sha256"):
+			dResults["gis"] = rawUnchanged # GIS data table already holds this payload
+			dCachePending["gis"] = dict(dEntry) # Refresh load time only
+		else:
+			dCachePending["gis"] = {"sha256": sHash, "body": sBody} # Body kept on disk only if needed, see 'commit_source_cache()'
+	return [dResults["gis"], dResults["api"]]
+
+# Function to Generate CIFS XML File (working feed unless another path is given, subset of feed when not bFullFeed)
+def generate_cifs_xml(dIncidents, sPath=None, bFullFeed=True):
+	# Load Cached Incident Fragments
+	conn = get_db() # Reuse connection
+	c = conn.cursor() # Create cursor
+	dCached = {}
+	iRenderKey = render_key() # Fragments rendered under other settings are stale
+	if bFragmentCache:
+		c.execute(sqlCreateFragments)
+		for row in c.execute("SELECT id, sha256, version, xml FROM fragments"):
+			dCached[row[0]] = row[1:]
+	lRendered = []
+
+	if sPath is None:
+		if not bFullFeed:
+			raise ValueError("Subset of incidents must not replace working feed") # Would be published as if whole
+		sPath = dirSource + fCIFSxml
+	sTemp = sPath + ".tmp" # Write beside target so a crash never leaves a truncated feed
+	with open(sTemp, "w", encoding="utf-8", buffering=65536) as fh:
+		# Initialize CIFS XML Headers
+		init_xml(fh, dIncidents["timestamp"])
+		#print(dIncidents["timestamp"])
+		# Construct CIFS XML Records, Splicing in Cached Fragments for Unchanged Incidents
+		for incident in dIncidents["incident"]:
+			cached = dCached.get(incident.id)
+			if cached and cached[0] == incident.sha256 and cached[1] == iRenderKey:
+				xmltxt = cached[2]
+			else:
+				xmltxt = render_incident(incident)
+				lRendered.append((incident.id, incident.sha256, iRenderKey, xmltxt))
 			fh.write(xmltxt)
-	# Finalize CIFS XML Footers
-	finalize_xml()
+		# Finalize CIFS XML Footers
+		finalize_xml(fh)
+		fh.flush()
+		os.fsync(fh.fileno())
+	os.replace(sTemp, sPath)
+
+	# Store Newly Rendered Fragments and Evict Incidents No Longer in Feed
+	if bFragmentCache:
+		setFeed = set(incident.id for incident in dIncidents["incident"])
+		lEvicted = [(key,) for key in dCached if key not in setFeed] if bFullFeed else [] # Only a full feed may evict fragments of incidents it leaves out
+		c.executemany(sqlRepFragments, lRendered)
+		c.executemany("DELETE FROM fragments WHERE id=?", lEvicted)
+		conn.commit() # Commit SQL Changes
+		dRunChurn["fragments"] = {"reused": len(dIncidents["incident"]) - len(lRendered), "rendered": len(lRendered), "evicted": len(lEvicted)}
 	return
 
-# Function to Parse Renew London Data
-def parse_renewlondon(gisData, apiData):
+# Function to Load Raw Source Data into Database, Skipping Database Stage When No Source Changed
+def load_source(rawData):
+	gisRows, disruptionRows = adapter_fn("normalize")(rawData)
+	if gisRows is None and disruptionRows is None:
+		msg = "SUCCESS: Sources unchanged since last load, database stage skipped!!"
+		print(msg)
+		msg_log(curUnixTime, msg)
+		dIncidents = time_stage("join", query_incidents)
+	else:
+		dIncidents = parse_source(gisRows, disruptionRows)
+	if dIncidents:
+		commit_source_cache() # Only a successful load may validate future conditional requests
+	return dIncidents
+
+# Function to Parse Normalized Source Rows into Database (None rows leave that table unchanged)
+def parse_source(gisRows, disruptionRows):
 	# Connect to SQL Database
-	conn = sql.connect(dirSource + sqlDBname) # Make connection
+	conn = get_db() # Reuse connection
 	c = conn.cursor() # Create cursor
-	c.execute("DELETE FROM gisdata") # Remove all GIS data records
-	c.execute("DELETE FROM disruptions") # Remove all Disruption data records
-	conn.commit() # Commit SQL Changes
+	c.execute("CREATE TEMP TABLE IF NOT EXISTS stage_checksum (id integer PRIMARY KEY, sha256 text NOT NULL)")
+	c.execute("CREATE TEMP TABLE IF NOT EXISTS stage_ids (id integer PRIMARY KEY)")
+	conn.execute("BEGIN") # Load, reconcile and join in one transaction per run
+	tStart = time.time()
+	dSynced = None # Ids written and removed by incremental sync, None when every row was reloaded
+	if dbSyncMode == "incremental":
+		# Diff GIS Information and Data Details by ID and Write Only Churned Rows
+		dUnchanged = {"inserted": 0, "changed": 0, "removed": 0}
+		dSynced = {"written": set(), "removed": set()}
+		dRunChurn["gisdata"] = sync_table(c, "gisdata", sqlRepGisdata, gisRows, index_geometry, dSynced) if gisRows is not None else dUnchanged
+		dRunChurn["disruptions"] = sync_table(c, "disruptions", sqlRepDisruptions, disruptionRows, None, dSynced) if disruptionRows is not None else dict(dUnchanged)
+		lCounts = []
+		for sTable in ("gisdata", "disruptions"):
+			lCounts.append(sTable + " " + str(dRunChurn[sTable]["inserted"]) + " inserted/" + str(dRunChurn[sTable]["changed"])
+				+ " changed/" + str(dRunChurn[sTable]["removed"]) + " removed")
+		msg = "SUCCESS: Database sync " + ", ".join(lCounts) + "!!"
+		print(msg)
+		msg_log(curUnixTime, msg)
+	else:
+		c.execute("DELETE FROM gisdata") # Remove all GIS data records
+		c.execute("DELETE FROM disruptions") # Remove all Disruption data records
 
-	# Query GIS Information by ID
-	for incident in gisData['features']:
-		sSQL = "INSERT INTO gisdata VALUES ("
-		sSQL += str(incident["id"]) + ","
-		sSQL += "'" + coord_to_poly(incident["geometry"]["coordinates"]) + "',"
-		sSQL += "'" + incident["properties"]["Street"] + "',"
-		sSQL += str(incident["properties"]["StartDate"] / 1000) + ","
-		sSQL += str(incident["properties"]["EndDate"] / 1000) + ")"
-		#print(sSQL)
-		c.execute(sSQL)
-		conn.commit() # Commit SQL Changes
+		# Bulk Load GIS Information and Data Details by ID
+		lGisRows = list(gisRows)
+		c.executemany(sqlInsGisdata, lGisRows)
+		c.executemany(sqlInsDisruptions, disruptionRows)
+		index_geometry(c, lGisRows, None) # Rebuild bounding box index
 
-	# Query Data Details by ID
-	for incident in apiData['Ongoing']:
-		sSQL = "INSERT INTO disruptions VALUES ("
-		sSQL += str(incident["Id"]) + ","
-		sSQL += "'" + chk_description(incident["WorkTypes"]) + "',"
-		sSQL += "'" + chk_short_description(incident["Impacts"]) + "',"
-		sSQL += "'" + chk_type(incident["RoadClosed"]) + "')"
-		#print(sSQL)
-		c.execute(sSQL)
-		conn.commit() # Commit SQL Changes
+	dRunTimes["db_load"] = time.time() - tStart
 
-	# Create Data Hash List
-	lChecksum = []
-	c.execute("SELECT * FROM gisdata INNER JOIN disruptions ON disruptions.id = gisdata.id") # Join tables on common ID
-	for row in c:
-		sHash = calc_sha256_hash(row) # Calculate Hash from Current Data
-		lChecksum.append({
-			"id": row[0],
-			"sha256": sHash
-			})
-		#print(lChecksum)
-
-	# Query and Update Hash Checksum Table
-	for row in lChecksum:
-		c.execute("SELECT * FROM checksum WHERE id=" + str(row["id"]))
-		lResults  = c.fetchall()
-		if len(lResults) > 0:
-			if len(lResults) > 1:
-				msg = "WARNING: Multiple checksum database records found for ID " + str(row["id"]) + "!!"
-				print(msg)
-				msg_log(curUnixTime, msg)
-			sSQL = "UPDATE checksum SET "
-			sSQL += "accesstime=" + str(curUnixTime)
-			if lResults[0][4] != row["sha256"]: # Check if cursor hash NOT same as new checksum hash
-				sSQL += ", updatetime=" + str(curUnixTime)
-				sSQL += ", sha256='" + row["sha256"] + "'"
-			sSQL += " WHERE id=" + str(row["id"])
-		else:
-			sSQL = "INSERT INTO checksum VALUES ("
-			sSQL += str(row["id"]) + "," # id
-			sSQL += str(curUnixTime) + "," # accesstime
-			sSQL += str(curUnixTime) + "," # creationtime
-			sSQL += str(curUnixTime) + "," # updatetime
-			sSQL += "'" + row["sha256"] + "')" #sha256
-		#print(sSQL)
-		c.execute(sSQL)
-		conn.commit() # Commit SQL Changes
-	c.execute("DELETE FROM checksum WHERE accesstime<" + str(curUnixTime)) # Remove all Disruption data records
-	conn.commit() # Commit SQL Changes8
+	# Stage Data Hashes and Reconcile Hash Checksum Table
+	tStart = time.time()
+	if dSynced is None:
+		c.execute(sqlSelHashRows) # Join tables on common ID
+	else:
+		c.execute("DELETE FROM stage_ids")
+		c.executemany("INSERT INTO stage_ids VALUES (?)", [(key,) for key in dSynced["written"]])
+		c.execute(sqlSelHashRowsSynced) # Only rows sync wrote can have changed hashes
+	lChecksum = [(row[0], calc_sha256_hash(row)) for row in c.fetchall()] # Calculate Hash from Current Data
+	reconcile_checksums(c, lChecksum, None if dSynced is None else dSynced["removed"])
+	conn.commit() # Commit SQL Changes
+	dRunTimes["checksum"] = time.time() - tStart
 
 	# Inner Join and Aggregate Database Data
-	c.execute("SELECT * FROM gisdata INNER JOIN disruptions ON disruptions.id = gisdata.id INNER JOIN checksum ON disruptions.id = checksum.id")
-	lResults  = c.fetchall()
-	#print(lResults)
-	if len(lResults) > 0:
-		dIncidents = create_incidents(lResults) # Create Incidents Dictionary
-	else:
-		msg = "ERROR: Final database inner join returned zero results!!"
-		print(msg)
-		msg_log(curUnixTime, msg)
+	dIncidents = time_stage("join", query_incidents)
+	if not dIncidents:
 		return False # No data available from query
 
-	# Close SQL Database
-	conn.close()
-
 	# Log Database Changes Completed
-	msg = "SUCCESS: Database successfully updated " + str(len(lResults)) + " records!!"
+	msg = "SUCCESS: Database successfully updated " + str(len(dIncidents["incident"])) + " records!!"
 	print(msg)
 	msg_log(curUnixTime, msg)
 
 	return dIncidents
 
+# Function to Query Incident IDs Whose Geometry Intersects Bounding Box
+def query_bbox(fMinLat, fMinLon, fMaxLat, fMaxLon):
+	tBox = (fMinLat, fMinLon, fMaxLat, fMaxLon)
+	return [row[0] for row in bbox_candidates(tBox) if line_in_bbox(unpack_blob(row[1]), tBox)]
+
 # Function to Query Incident Details
 def query_details():
-	urllib3.disable_warnings() # Disable SSL Warnings from Renew London API
-	http = urllib3.PoolManager()
-	response = http.request("GET", apiRLdisruptions)
-	#print(response.data.decode('utf-8'))
 	try:
-		if response.status == 200:
-			#reader = codecs.getreader("utf-8")
-			return json.loads(response.data.decode('utf-8'))
-		else:
+		bBody, bUnchanged = http_get_cached("api", apiRLdisruptions)
+		#print(bBody.decode('utf-8'))
+		if bConditionalGet and bUnchanged and dbSyncMode == "incremental": # Same gate as GIS body-hash skip
+			return rawUnchanged # Disruptions table already holds this payload, skip parsing
+		if bBody is None:
 			return False
+		#reader = codecs.getreader("utf-8")
+		return json.loads(bBody.decode('utf-8'))
 	except:
 		msg_log(curUnixTime, "ERROR: API Disruptions query did not complete!!")
 		return False
 
 # Function to Query GIS Data
 def query_gis():
+	if gisFetchMode == "http":
+		return query_gis_http()
+	if gisFetchMode == "daemon":
+		return query_gis_daemon()
+	return query_gis_selenium()
+
+# Function to Query GIS Data from Warm Browser Daemon
+def query_gis_daemon():
 	try:
-		# Initialize Virtual Display
-		display = Display(visible=0, size=(800, 600))
-		display.start()
-		# Selenium Webdriver Options and Start
-		options = webdriver.ChromeOptions()
-		options.add_argument('--no-sandbox')
-		options.add_argument('--headless')
+		sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		sock.settimeout(secPageWait + secTimeout) # Allow daemon to recycle browser once before giving up
+		sock.connect(sockScraper)
+		sock.sendall(b"SCRAPE\n")
+		lChunks = []
+		while True:
+			chunk = sock.recv(65536)
+			if not chunk:
+				break
+			lChunks.append(chunk)
+		sock.close()
+		dReply = json.loads(b"".join(lChunks).decode('utf-8'))
+		if dReply["status"] == "ok":
+			return dReply["data"]
+		msg_log(curUnixTime, "ERROR: GIS scraper daemon reported " + dReply["error"] + "!!")
+		return False
+	except:
+		msg_log(curUnixTime, "ERROR: GIS scraper daemon query did not complete!!")
+		return False
+
+# Function to Query GIS Data Without Browser
+def query_gis_http():
+	http = get_http()
+	try:
+		if apiRLgis: # Backing endpoint returns feature collection directly
+			response = http.request("GET", apiRLgis)
+			if response.status == 200:
+				return json.loads(response.data.decode('utf-8'))
+			return False
+		response = http.request("GET", urlRlmain) # Otherwise read embedded script payload from main website
+		if response.status == 200:
+			return extract_gis_payload(response.data.decode('utf-8'))
+		return False
+	except:
+		msg_log(curUnixTime, "ERROR: GIS HTTP query did not complete!!")
+		return False
+
+# Function to Query GIS Data Through Headless Browser
+def query_gis_selenium():
+	tBrowser = None
+	try:
+		tBrowser = time_stage("browser_start", start_browser)
+		lBrowsers.append(tBrowser)
+		display, driver = tBrowser
 		# Access and Scrape Main Website
-		driver = webdriver.Chrome("/usr/local/bin/chromedriver", chrome_options=options)
 		driver.get(urlRlmain) # Load main website
-		time.sleep(secSleep) # Pause to allow website data to load
-		gisData = driver.execute_script(apiJSobj) # Scrape GIS Data
+		gisData = wait_for_gis(driver) # Scrape GIS Data once populated
 		#print(gisData)
-		time.sleep(secSleep)
-		driver.close() # Close Webdriver
-		display.sendstop() # Stop Virtual Display
+		lBrowsers.remove(tBrowser)
+		stop_browser(display, driver)
 		return gisData
 	except:
+		if tBrowser is not None and tBrowser not in lBrowsers:
+			return False # Browser torn down after fetch deadline, already logged
+		if tBrowser is not None:
+			stop_browsers([tBrowser])
+		if stale_entry("gis") is not None:
+			msg_log(curUnixTime, "ERROR: GIS Scrape query did not complete!!") # Last-known-good data covers this run, no reboot
+			return False
 		msg = "ERROR: GIS Scrape query did not complete, rebooting server!!"
 		print(msg)
 		msg_log(curUnixTime, msg)
@@ -335,39 +643,374 @@ def query_gis():
 		time.sleep(secSleep) # Pause to allow reboot to occur
 		return False
 
-# Function to Handle Database Update
-def update_db():
-	# Scrape GIS Data from Public Website
-	msg = "ERROR: GIS data scrape failed!!" # If error
+# Function to Query Joined Incident Records from Database (optionally restricted to incident IDs)
+def query_incidents(lIds=None):
+	conn = get_db()
+	c = conn.cursor() # Create cursor
+	sSQL = sqlSelIncidents
+	if lIds is not None:
+		c.execute("CREATE TEMP TABLE IF NOT EXISTS query_ids (id integer PRIMARY KEY)")
+		c.execute("DELETE FROM query_ids")
+		c.executemany("INSERT OR IGNORE INTO query_ids VALUES (?)", [(key,) for key in lIds])
+		sSQL += " INNER JOIN query_ids ON query_ids.id = gisdata.id"
+	c.row_factory = Incident # Rows arrive as incident records
+	c.execute(sSQL)
+	lResults  = c.fetchall()
+	if lIds is not None:
+		conn.commit() # Close implicit transaction opened by staging IDs
+	#print(lResults)
+	if len(lResults) > 0:
+		return create_incidents(lResults) # Create Incidents Dictionary
+	msg = "ERROR: Final database inner join returned zero results!!"
+	print(msg)
+	msg_log(curUnixTime, msg)
+	return False
+
+# Function to Query Incident IDs Within Radius of Point, Nearest First
+def query_near(fLat, fLon, mRadius):
+	fDLat = mRadius / 110540.0
+	fDLon = mRadius / (111320.0 * math.cos(math.radians(fLat)))
+	lNear = []
+	for row in bbox_candidates((fLat - fDLat, fLon - fDLon, fLat + fDLat, fLon + fDLon)):
+		mDist = line_distance(unpack_blob(row[1]), fLat, fLon)
+		if mDist <= mRadius:
+			lNear.append((row[0], mDist))
+	return sorted(lNear, key=lambda near: (near[1], near[0]))
+
+# Function to Refresh Per-Cycle State
+def reset_run():
+	global curUnixTime
+	curUnixTime = int(time.time())
+	dRunTimes.clear()
+	dRunChurn.clear()
+	dRunStatus.clear()
+	return
+
+# Function to Run One Command for One Source Adapter
+def run_adapter(sName, opts):
+	global sLogPrefix, bCapture, urlRlbase, urlRlmain, apiRLdisruptions, apiRLgis
+	use_adapter(sName)
+	bCapture = bCapture or opts.capture
+	if opts.base_url:
+		urlRlmain, apiRLdisruptions, apiRLgis = [sURL.replace(urlRlbase, opts.base_url.rstrip("/"), 1) for sURL in (urlRlmain, apiRLdisruptions, apiRLgis)]
+		urlRlbase = opts.base_url.rstrip("/")
+	if len(opts.source or lAdapters) > 1:
+		sLogPrefix = "[" + sName + "] "
+	dCommands = {
+		"daemon": run_daemon,
+		"fetch": run_fetch,
+		"load": run_load,
+		"render": lambda: run_render(opts.bbox, opts.output),
+		"validate": run_validate,
+		"publish": run_publish,
+		"query": lambda: run_query(opts.bbox, opts.near, opts.radius),
+		"replay": lambda: run_replay(opts.paths, opts.speed, opts.workdir)
+		}
 	try:
-		gisData = query_gis()
-		if not gisData:
-			print(msg)
-			msg_log(curUnixTime, msg)
+		return dCommands.get(opts.command, run_once)() is not False
+	except Exception as exc:
+		msg_log(curUnixTime, "ERROR: Source adapter " + sName + " failed (" + type(exc).__name__ + ": " + str(exc) + ")!!")
+		raise
+
+# Function to Run One Command for Several Source Adapters in Parallel Processes with Isolated Failures
+def run_adapters(lNames, opts):
+	pool = futures.ProcessPoolExecutor(max_workers=len(lNames))
+	dFutures = {}
+	for sName in lNames:
+		dFutures[pool.submit(run_adapter, sName, opts)] = sName
+	bOk = True
+	for future in futures.as_completed(dFutures): # Report each source as soon as it finishes
+		sName = dFutures[future]
+		try:
+			bDone = future.result()
+		except Exception as exc:
+			bDone = False
+			msg_log(curUnixTime, "ERROR: Source adapter " + sName + " process failed (" + type(exc).__name__ + ")!!")
+		print(sName + ": " + ("done" if bDone else "failed"))
+		bOk = bOk and bDone
+	pool.shutdown()
+	return bOk
+
+# Function to Run One Update, Render, Validate and Publish Cycle and Export Its Metrics
+def run_cycle():
+	tStart = time.time()
+	bOk = False
+	try:
+		bOk = run_stages() is not False
+	finally:
+		if bMetrics:
+			export_metrics(bOk, time.time() - tStart)
+	return bOk
+
+# Function to Run Update Cycles Forever on Adaptive, Jittered Schedule
+def run_daemon():
+	secInterval = secIntervalStart
+	msg = "SUCCESS: CIFS XML daemon started!!"
+	print(msg)
+	msg_log(int(time.time()), msg)
+	while True:
+		reset_run()
+		evRetry.clear()
+		try:
+			run_cycle()
+		except Exception as exc:
+			msg_log(curUnixTime, "ERROR: CIFS XML daemon cycle failed (" + str(exc) + ")!!")
+		if sqlConn is not None and sqlConn.in_transaction:
+			sqlConn.rollback() # Discard work of a stage cut off by its deadline before reusing connection
+		secInterval = next_interval(secInterval)
+		evRetry.wait(secInterval * random.uniform(1 - fIntervalJitter, 1 + fIntervalJitter)) # Cut short once a failed source recovers
+	return
+
+# Function to Fetch Sources into Snapshot File ('fetch' Command)
+def run_fetch():
+	rawData = adapter_fn("fetch")()
+	if not rawData:
+		return False
+	if bCapture:
+		capture_source(rawData)
+	write_atomic(dirSource + fSnapshot, json.dumps({"time": curUnixTime, "adapter": sAdapter, "data": rawData, "cache": dCachePending}).encode('utf-8'))
+	print("Fetched " + sAdapter + " source data into " + dirSource + fSnapshot)
+	return True
+
+# Function to Complete Future with Result or Exception of Call
+def run_future(future, fn, args):
+	if not future.set_running_or_notify_cancel():
+		return
+	try:
+		future.set_result(fn(*args))
+	except BaseException as exc:
+		future.set_exception(exc)
+	return
+
+# Function to Load Snapshot File into Database ('load' Command)
+def run_load():
+	with open(dirSource + fSnapshot) as fh:
+		dSnapshot = json.load(fh)
+	dCachePending.update(dSnapshot.get("cache", {}))
+	return load_source(dSnapshot["data"]) is not False
+
+# Function to Run One Cycle, Then One Catch-Up Cycle if a Failed Source Recovers Within Retry Window
+def run_once():
+	bOk = run_cycle()
+	if (setRetrying or dRetryResults) and evRetry.wait(secRetryWindow):
+		msg = "SUCCESS: Failed source recovered, running catch-up cycle!!"
+		print(msg)
+		msg_log(int(time.time()), msg)
+		reset_run()
+		bOk = run_cycle()
+	return bOk
+
+# Function to Publish CIFS XML File, Sidecars and Manifest ('publish' Command)
+def run_publish():
+	dIncidents = query_incidents()
+	if not dIncidents:
+		return False
+	dManifest = publish_sidecars(feed_digest(dIncidents), len(dIncidents["incident"])) # Sidecars first, so gzip readers never lag the swapped feed
+	publish_xml()
+	publish_manifest(dManifest)
+	print("Published " + dirDest + fCIFSxml)
+	return True
+
+# Function to List Incidents in Bounding Box or Near Point ('query' Command)
+def run_query(lBbox, lNear, mRadius):
+	if lNear:
+		lFound = query_near(lNear[0], lNear[1], mRadius)
+	else:
+		lFound = [(key, None) for key in query_bbox(*lBbox)]
+	if lFound:
+		dIncidents = query_incidents([key for key, mDist in lFound])
+		dById = dict((incident.id, incident) for incident in (dIncidents["incident"] if dIncidents else []))
+		for key, mDist in lFound:
+			incident = dById.get(key)
+			if incident:
+				print("%8d  %-12s %s%s" % (key, incident.type, incident.street, "" if mDist is None else "  (%.0f m)" % mDist))
+	print(str(len(lFound)) + " incidents found")
+	return True
+
+# Function to Render CIFS XML File from Database ('render' Command)
+def run_render(lBbox=None, sOutput=None):
+	lIds = None
+	if lBbox:
+		if not sOutput:
+			print("Rendering a bounding box requires '--output', the working feed must stay complete")
+			return False
+		lIds = query_bbox(*lBbox)
+		if not lIds:
+			print("No incidents intersect bounding box, nothing rendered")
 			return False
+	dIncidents = query_incidents(lIds)
+	if not dIncidents:
+		return False
+	time_stage("render", generate_cifs_xml, dIncidents, sOutput, lIds is None)
+	print("Rendered " + str(len(dIncidents["incident"])) + " incidents to " + (sOutput or dirSource + fCIFSxml) + " in %.1f ms" % (dRunTimes["render"] * 1000))
+	return True
+
+# Function to Replay Captured Source Data Through Load, Render and Validate Against Fresh Database ('replay' Command)
+def run_replay(lPaths, fSpeed=0, sWorkdir=None):
+	global dirSource, dirDest, fMsgLog, sqlConn, dSourceCache, curUnixTime
+	lCaptures = list_captures(lPaths or [dirSource + dirCapture])
+	if not lCaptures:
+		print("No " + sAdapter + " captures found")
+		return False
+	sSchema = dirSource + fCIFSschema
+	if not os.path.exists(sSchema):
+		sSchema = os.path.join(os.path.dirname(os.path.abspath(__file__)), fCIFSschema) # Offline machine, schema shipped with script
+	dirWork = sWorkdir or tempfile.mkdtemp(prefix="cifs-replay-")
+	os.makedirs(dirWork, exist_ok=True)
+	shutil.copyfile(sSchema, os.path.join(dirWork, fCIFSschema))
+	if sqlConn is not None:
+		sqlConn.close()
+	dirSource = dirDest = os.path.join(dirWork, "") # Never touch live database, feed or message log
+	fMsgLog = dirSource + "messages.html"
+	sqlConn, dSourceCache = None, None
+	dCachePending.clear()
+	bOk = True
+	dTotals = {}
+	tPrevious = None
+	print("%-25s %9s %16s %16s %8s %8s %8s %6s" % ("capture time", "incidents", "gisdata i/c/r", "disruptions i/c/r", "load ms", "render ms", "valid ms", "errors"))
+	try:
+		for tCapture, sPath in lCaptures:
+			with gzip.open(sPath, "rt", encoding="utf-8") as fh:
+				dCapture = json.load(fh)
+			if fSpeed > 0 and tPrevious is not None:
+				time.sleep(max(0, tCapture - tPrevious) / fSpeed) # Time-accelerated pace of recorded runs
+			tPrevious = tCapture
+			reset_run()
+			curUnixTime = tCapture # Timestamps as at capture, so replays are deterministic
+			with contextlib.redirect_stdout(io.StringIO()): # Keep per-stage messages out of replay table
+				dIncidents = time_stage("load", load_source, dCapture["data"])
+				lErrors = None
+				if dIncidents:
+					time_stage("render", generate_cifs_xml, dIncidents)
+					lErrors = time_stage("validate", validate_xml, dirSource + fCIFSxml)
+			if not dIncidents or lErrors is None or lErrors:
+				bOk = False
+			dGis, dDis = dRunChurn.get("gisdata", {}), dRunChurn.get("disruptions", {})
+			print("%-25s %9s %16s %16s %8.1f %8.1f %8.1f %6s" % (
+				datetime_in_iso(tCapture),
+				len(dIncidents["incident"]) if dIncidents else "failed",
+				"%d/%d/%d" % (dGis.get("inserted", 0), dGis.get("changed", 0), dGis.get("removed", 0)),
+				"%d/%d/%d" % (dDis.get("inserted", 0), dDis.get("changed", 0), dDis.get("removed", 0)),
+				dRunTimes.get("load", 0) * 1000, dRunTimes.get("render", 0) * 1000, dRunTimes.get("validate", 0) * 1000,
+				"-" if lErrors is None else len(lErrors)
+				))
+			for sStage in ("load", "render", "validate"):
+				dTotals[sStage] = dTotals.get(sStage, 0) + dRunTimes.get(sStage, 0)
+	finally:
+		if sqlConn is not None:
+			sqlConn.close()
+			sqlConn = None
+		if not sWorkdir:
+			shutil.rmtree(dirWork, ignore_errors=True)
+	print("Replayed %d captures: load %.1f ms, render %.1f ms, validate %.1f ms mean per capture" % tuple([len(lCaptures)] + [dTotals.get(sStage, 0) * 1000 / len(lCaptures) for sStage in ("load", "render", "validate")]))
+	return bOk
+
+# Function to Run Update, Render, Validate and Publish Stages of One Cycle
+def run_stages():
+	# Update Incidents from Database
+	try:
+		with stage_deadline("update", secTimeout):
+			dIncidents = time_stage("update", update_db)
+			#loop_forever() # TEST CALL
+	except Exception as exc:
+		run_failed("update")
+		msg_log(curUnixTime, str(exc)) # Log exception message
+		return False
+	if not dIncidents:
+		run_failed("update")
+		return False # Fetch or parse failure already logged
+	dTypes = {}
+	for incident in dIncidents["incident"]:
+		dTypes[incident.type] = dTypes.get(incident.type, 0) + 1
+	dRunStatus["incidents"] = dTypes
+
+	# Skip Publish When Incident Set Unchanged Since Last Publish
+	bValidate = True
+	if dIncidents:
+		sDigest = feed_digest(dIncidents)
+		if bSkipUnchanged and sDigest == read_manifest().get("digest") and os.path.exists(dirDest + fCIFSxml):
+			if not bRefreshTimestamp:
+				msg = "SUCCESS: CIFS XML feed unchanged, publish skipped!!"
+				print(msg)
+				msg_log(curUnixTime, msg)
+				dRunStatus["outcome"] = "skipped"
+				return
+			bValidate = False # Only root timestamp differs from validated feed
+
+	# Generate CIFS XML File
+	try:
+		with stage_deadline("render", dStageDeadlines["render"]):
+			time_stage("render", generate_cifs_xml, dIncidents)
 	except:
+		run_failed("render")
+		msg = "ERROR: CIFS XML file failed to generate!!"
 		print(msg)
 		msg_log(curUnixTime, msg)
 		return False
 
-	# Query Disruptions Data from Public API
-	msg = "ERROR: Disruption data API query failed!!" # If error
-	try:
-		apiData = query_details()
-		if not apiData:
+	# Validate CIFS XML Against Local Schema
+	lErrors = []
+	if bValidate:
+		try:
+			with stage_deadline("validate", dStageDeadlines["validate"]):
+				lErrors = time_stage("validate", validate_xml, dirSource + fCIFSxml)
+		except Exception as exc:
+			lErrors = [{"incident": None, "path": None, "line": None, "message": str(exc)}]
+	if lErrors:
+		run_failed("validate")
+		msg = "ERROR: CIFS XML file did not validate against schema!!"
+		print(msg)
+		msg_log(curUnixTime, msg)
+		for error in lErrors[:nLogErrors]:
+			msg = "ERROR: Incident " + str(error["incident"]) + " at " + str(error["path"]) + " (line " + str(error["line"]) + "): " + error["message"]
 			print(msg)
 			msg_log(curUnixTime, msg)
-			return False
+		return False
+
+	# Link CIFS XML File to Public Folder
+	### Waze ideally recommends a symbolic link, both modes swap the public file atomically.
+	try:
+		with stage_deadline("publish", dStageDeadlines["publish"]):
+			dManifest = time_stage("sidecars", publish_sidecars, sDigest, len(dIncidents["incident"])) # Sidecars first, so gzip readers never lag the swapped feed
+			time_stage("publish", publish_xml)
+			publish_manifest(dManifest) # Recorded only once feed and sidecars are both in place
 	except:
+		run_failed("publish")
+		msg = "ERROR: CIFS XML file did not transfer to public folder!!"
 		print(msg)
 		msg_log(curUnixTime, msg)
 		return False
 
-	# Parse Renew London Data into Python Dictionary
+	# Record Success Message in Log File
+	msg = "SUCCESS: Updated CIFS XML file generated!!"
+	print(msg)
+	msg_log(curUnixTime, msg)
+	dRunStatus["outcome"] = "published" if bValidate else "refreshed"
+
+	return
+
+# Function to Validate CIFS XML File ('validate' Command)
+def run_validate():
+	lErrors = time_stage("validate", validate_xml, dirSource + fCIFSxml)
+	for error in lErrors:
+		print("Incident " + str(error["incident"]) + " at " + str(error["path"]) + " (line " + str(error["line"]) + "): " + error["message"])
+	print(("Valid" if not lErrors else "Invalid") + " CIFS XML file, validated in %.1f ms" % (dRunTimes["validate"] * 1000))
+	return not lErrors
+
+# Function to Handle Database Update
+def update_db():
+	# Fetch Source Data (Renew London scrapes GIS data and queries disruptions data concurrently)
+	rawData = adapter_fn("fetch")()
+	if not rawData:
+		return False
+	if bCapture:
+		capture_source(rawData)
+
+	# Parse Source Data into Python Dictionary
 	msg = "ERROR: Data dictionary did not parse!!" # If error
 	try:
-		dIncidents = parse_renewlondon(gisData, apiData)
-		if not apiData:
+		dIncidents = load_source(rawData)
+		if not dIncidents:
 			print(msg)
 			msg_log(curUnixTime, msg)
 			return False
@@ -381,18 +1024,70 @@ def update_db():
 # HELPER (MONKEY) FUNCTIONS
 # -------------------------
 
+# Function to Resolve Function of Active Source Adapter
+def adapter_fn(sKey):
+	fn = dAdapters[sAdapter][sKey]
+	return globals()[fn] if isinstance(fn, str) else fn
+
+# Function to Select Candidate Incidents Overlapping Bounding Box (R-tree index, or linear scan without it)
+def bbox_candidates(tBox):
+	c = get_db().cursor()
+	if bSpatialIndex:
+		return c.execute(sqlSelRtree, (tBox[0], tBox[2], tBox[1], tBox[3])).fetchall()
+	return c.execute("SELECT id, polyline FROM gisdata").fetchall()
+
+# Function to Calculate Bounding Box of Packed Geometry BLOB (minlat, maxlat, minlon, maxlon)
+def blob_bbox(bGeometry):
+	aValues = unpack_blob(bGeometry)
+	lLat, lLon = aValues[0::2], aValues[1::2]
+	fScale = float(coordScale)
+	return (min(lLat) / fScale, max(lLat) / fScale, min(lLon) / fScale, max(lLon) / fScale)
+
+# Function to Format Packed Geometry BLOB as Polyline String (Render Time Only)
+def blob_to_poly(bGeometry):
+	if isinstance(bGeometry, str):
+		return bGeometry # Legacy text polyline awaiting migration
+	aValues = unpack_blob(bGeometry)
+	iPrecision = 7 if coordPrecision is None else coordPrecision # None renders all digits stored at 1e7 fixed point, not input precision
+	sFormat = "%." + str(iPrecision) + "f"
+	fScale = float(coordScale)
+	return " ".join([sFormat % (value / fScale) for value in aValues])
+
 # Function to Calculate SHA256 Hash
-def calc_sha256_hash(tRow): # Input Tuple Row and Pull Offset Values
-	sData = str(tRow[0]) # id
-	sData += tRow[1] # polyline
-	sData += tRow[2] # street
+def calc_sha256_hash(tRow): # Input Tuple Row in 'sqlSelHashRows' Column Order
+	oHash = hashlib.sha256(str(tRow[0]).encode('utf-8')) # id
+	oHash.update(tRow[1] if isinstance(tRow[1], bytes) else tRow[1].encode('utf-8')) # polyline, hashed as stored
+	sData = tRow[2] # street
 	sData += str(tRow[3]) # starttime
 	sData += str(tRow[4]) # endtime
-	sData += tRow[6] # description
-	sData += tRow[7] # short_description
-	sData += tRow[8] # type
+	sData += tRow[5] # description
+	sData += chk_short_description(tRow[6]) # short_description, nullable
+	sData += tRow[7] # type
 	#print(sData)
-	return hashlib.sha256(sData.encode('utf-8')).hexdigest() # Create Unique String from Aggregated Data
+	oHash.update(sData.encode('utf-8'))
+	return oHash.hexdigest() # Create Unique String from Aggregated Data
+
+# Function to Record Raw Source Data of Current Run as Gzipped Capture, Pruning Expired Captures
+def capture_source(rawData):
+	lParts = dAdapters[sAdapter].get("parts", [])
+	lData = list(rawData)
+	for i, sPart in enumerate(lParts):
+		if lData[i] == rawUnchanged: # Capture must replay on its own, so store the payload this marker stands for
+			sBody = dCachePending.get(sPart, {}).get("body") or load_source_body(sPart)
+			if sBody is not None:
+				lData[i] = json.loads(sBody)
+	sStem = os.path.splitext(sqlDBname)[0]
+	try:
+		os.makedirs(dirSource + dirCapture, exist_ok=True)
+		bDoc = json.dumps({"time": curUnixTime, "adapter": sAdapter, "data": lData, "stale": dRunStatus.get("stale", {})}).encode('utf-8')
+		write_atomic(dirSource + dirCapture + sStem + "-" + str(curUnixTime) + ".json.gz", gzip.compress(bDoc, 6))
+		if dayCaptureKeep > 0:
+			for tCapture, sPath in list_captures([dirSource + dirCapture]):
+				if tCapture < curUnixTime - dayCaptureKeep * 86400:
+					os.remove(sPath)
+	except OSError as exc:
+		msg_log(curUnixTime, "WARNING: Source data capture could not be written (" + str(exc) + ")!!")
+	return
 
 # Function to Check Description for Default Value
 def chk_description(isValue):
@@ -415,40 +1110,371 @@ def chk_type(isClosed):
 	else:
 		return "CONSTRUCTION"
 
-# Function to Convert GIS Coordinates to Polyline String
-def coord_to_poly(lCoord):
-	sPolyline = ""
-	first = True
+# Function to Commit Pending Source Cache Entries After Successful Load
+def commit_source_cache():
+	if not dCachePending:
+		return
+	bKeepBodies = dbSyncMode != "incremental" or bCapture # Incremental fallback and skips only need 'rawUnchanged'
+	dCache = load_source_cache()
+	for sKey, dEntry in dCachePending.items():
+		sBody = dEntry.pop("body", None)
+		if bKeepBodies and sBody is not None and (dEntry.get("sha256") != dCache.get(sKey, {}).get("sha256") or not os.path.exists(source_body_path(sKey))):
+			write_atomic(source_body_path(sKey), sBody.encode('utf-8')) # Only when payload changed
+		dEntry["loaded"] = curUnixTime # Age of last-known-good data is measured from here
+	dCache.update(dCachePending)
+	dCachePending.clear()
+	write_atomic(dirSource + fSourceCache, json.dumps(dSourceCache).encode('utf-8'))
+	return
+
+# Function to Pack GIS Coordinates as Fixed-Point int32 BLOB (latitude, longitude interleaved, little-endian)
+def coord_to_blob(lCoord):
+	if mSimplifyTolerance > 0 and len(lCoord) > 2:
+		lCoord = simplify_line(lCoord, mSimplifyTolerance)
+	if coordPrecision is not None:
+		lCoord = [(round(xy[0], coordPrecision), round(xy[1], coordPrecision)) for xy in lCoord] # Quantize before packing
+	aValues = array.array("i")
 	for xy in lCoord:
-		if first:
-			first = False
-		else:
-			sPolyline += " "
-		sPolyline += str(xy[1]) + " " + str(xy[0])
-	return sPolyline
+		aValues.append(int(round(xy[1] * coordScale)))
+		aValues.append(int(round(xy[0] * coordScale)))
+	if sys.byteorder != "little":
+		aValues.byteswap()
+	return aValues.tobytes()
+
+# Function to Convert Unix Timestamp to RFC 3339 / ISO 8601 Format
+def datetime_in_iso(ts=None):
+	if ts is None:
+		ts = time.time()
+	return format_iso(int(ts))
 
-# Function to Convert Date/Time String to ISO 8601 Format
-def datetime_in_iso(ts=time.time()):
-	ts = parser.parse(datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S'))
-	return ts.replace(microsecond=0).isoformat() + '-0' + str(int(time.timezone / 3600)) + ':00'
+# Function to Convert Column of Unix Timestamps to RFC 3339 / ISO 8601 Format in One Pass
+def datetimes_in_iso(lTs):
+	return [format_iso(int(ts)) for ts in lTs] # Repeated values hit memo cache
+
+# Function to Convert Disruptions API Data to Table Rows
+def disruptions_rows(apiData):
+	for incident in apiData['Ongoing']:
+		yield (
+			incident["Id"],
+			chk_description(incident["WorkTypes"]),
+			chk_short_description(incident["Impacts"]),
+			chk_type(incident["RoadClosed"])
+			)
+
+# Function to Export Cycle Metrics as Prometheus Textfile and JSON Run Summary
+def export_metrics(bOk, secRun):
+	sSummary = dirSource + fRunSummary
+	dPrevious = {}
+	if os.path.exists(sSummary):
+		try:
+			with open(sSummary) as fh:
+				dPrevious = json.load(fh)
+		except ValueError:
+			pass # Corrupt summary, restart cumulative counts
+	dFailures = dict(dPrevious.get("failures_total", {}))
+	if not bOk:
+		sReason = dRunStatus.get("failure", "unknown")
+		dFailures[sReason] = dFailures.get(sReason, 0) + 1
+	dHttp = dRunStatus.get("http", {})
+	dHttpTotals = {}
+	for sKey in ("requests", "hits", "bytes"):
+		dHttpTotals[sKey] = dPrevious.get("http_totals", {}).get(sKey, 0) + dHttp.get(sKey, 0)
+	dBytes = {}
+	for sExt in ("", ".gz", ".br"):
+		if os.path.exists(dirDest + fCIFSxml + sExt):
+			dBytes[sExt.lstrip(".") or "xml"] = os.path.getsize(dirDest + fCIFSxml + sExt)
+	dSummary = {
+		"source": sAdapter,
+		"time": curUnixTime,
+		"ok": bOk,
+		"outcome": dRunStatus.get("outcome", "published" if bOk else "failed"),
+		"failure": None if bOk else dRunStatus.get("failure", "unknown"),
+		"run_seconds": secRun,
+		"stages": dict(dRunTimes),
+		"incidents": dRunStatus.get("incidents", {}),
+		"churn": dict(dRunChurn),
+		"output_bytes": dBytes,
+		"failures_total": dFailures,
+		"http": dHttp,
+		"http_totals": dHttpTotals,
+		"http_hit_rate": float(dHttpTotals["hits"]) / dHttpTotals["requests"] if dHttpTotals["requests"] else None,
+		"stale_seconds": dRunStatus.get("stale", {}),
+		"last_success": curUnixTime if bOk else dPrevious.get("last_success")
+		}
+	write_atomic(sSummary, json.dumps(dSummary, indent=2).encode('utf-8'))
+
+	# Prometheus Text Exposition Format, One Sample per Line with Source Label
+	lLines = []
+	lLines += prom_lines("waze_cifs_run_success", "gauge", "Whether the last cycle succeeded", [({}, int(bOk))])
+	lLines += prom_lines("waze_cifs_run_seconds", "gauge", "Wall time of the last cycle", [({}, secRun)])
+	lLines += prom_lines("waze_cifs_run_outcome", "gauge", "Outcome of the last cycle", [({"outcome": dSummary["outcome"]}, 1)])
+	lLines += prom_lines("waze_cifs_last_run_timestamp_seconds", "gauge", "Unix time of the last cycle", [({}, curUnixTime)])
+	if dSummary["last_success"]:
+		lLines += prom_lines("waze_cifs_last_success_timestamp_seconds", "gauge", "Unix time of the last successful cycle", [({}, dSummary["last_success"])])
+	lLines += prom_lines("waze_cifs_stage_seconds", "gauge", "Duration of each stage in the last cycle", [({"stage": sStage}, secStage) for sStage, secStage in sorted(dRunTimes.items())])
+	lLines += prom_lines("waze_cifs_incidents", "gauge", "Incidents in the last feed by type", [({"type": sType}, n) for sType, n in sorted(dSummary["incidents"].items())])
+	lLines += prom_lines("waze_cifs_churn_rows", "gauge", "Rows inserted, changed or removed and fragments reused or rendered in the last cycle",
+		[({"table": sTable, "change": sChange}, n) for sTable, dCounts in sorted(dRunChurn.items()) for sChange, n in sorted(dCounts.items())])
+	lLines += prom_lines("waze_cifs_output_bytes", "gauge", "Size of published feed files", [({"file": sFile}, n) for sFile, n in sorted(dBytes.items())])
+	lLines += prom_lines("waze_cifs_http_requests_total", "counter", "Source HTTP requests", [({}, dHttpTotals["requests"])])
+	lLines += prom_lines("waze_cifs_http_cache_hits_total", "counter", "Source HTTP requests answered 304 or with unchanged body", [({}, dHttpTotals["hits"])])
+	lLines += prom_lines("waze_cifs_http_bytes_total", "counter", "Source HTTP body bytes transferred", [({}, dHttpTotals["bytes"])])
+	lLines += prom_lines("waze_cifs_source_stale_seconds", "gauge", "Age of last-known-good data used for sources that failed in the last cycle",
+		[({"part": sKey}, secAge) for sKey, secAge in sorted(dRunStatus.get("stale", {}).items())])
+	lLines += prom_lines("waze_cifs_failures_total", "counter", "Failed cycles by first failure reason", [({"reason": sReason}, n) for sReason, n in sorted(dFailures.items())])
+	try:
+		write_atomic(dirMetrics + fMetrics, "".join(lLines).encode('utf-8'))
+	except OSError:
+		msg_log(curUnixTime, "WARNING: Metrics textfile could not be written to " + dirMetrics + "!!")
+	return
+
+# Function to Extract GIS Feature Collection from Page Script Payload
+def extract_gis_payload(sPage):
+	decoder = json.JSONDecoder()
+	for match in reJSobj.finditer(sPage):
+		try:
+			gisData, _ = decoder.raw_decode(sPage, match.end()) # Decode literal in place, ignoring trailing script
+		except ValueError:
+			continue # Not a JSON literal (e.g. reassignment from AJAX result), keep searching
+		if isinstance(gisData, dict) and "features" in gisData:
+			return gisData
+	return False
+
+# Function to Substitute Last-Known-Good Data for a Failed Source Within Staleness Budget (False if none)
+def fallback_source(sKey):
+	dEntry = stale_entry(sKey)
+	if dEntry is None:
+		return False
+	if dbSyncMode == "incremental":
+		rawData = rawUnchanged # Table still holds last loaded payload
+	else:
+		sBody = load_source_body(sKey)
+		if sBody is None:
+			return False
+		rawData = json.loads(sBody)
+	dRunStatus.setdefault("stale", {})[sKey] = curUnixTime - dEntry["loaded"]
+	return rawData
+
+# Function to Calculate Digest over Published Incident Set
+def feed_digest(dIncidents):
+	oHash = hashlib.sha256(("v" + str(render_key())).encode('utf-8'))
+	for incident in dIncidents["incident"]:
+		oHash.update((str(incident.id) + ":" + incident.sha256 + "\n").encode('utf-8'))
+	return oHash.hexdigest()
+
+# Function to Run One Source Fetch with Its Own Pending Cache Entries, Returning (data, entries)
+def fetch_source(fn):
+	tlsFetch.pending = {}
+	try:
+		return fn(), tlsFetch.pending
+	finally:
+		del tlsFetch.pending
 
 # Function to Finalize CIFS XML File
-def finalize_xml():
+def finalize_xml(fh):
 	xmltxt = '</incidents>\n'
-	with open(dirSource + fCIFSxml, "a") as fh:
-		fh.write(xmltxt)
+	fh.write(xmltxt)
+	return
+
+# Function to Format One Unix Timestamp with Zone-Correct Offset (Memoized)
+@functools.lru_cache(maxsize=65536)
+def format_iso(ts):
+	return datetime.fromtimestamp(ts, get_tz()).replace(microsecond=0).isoformat()
+
+# Function to Get Shared SQLite Connection
+def get_db():
+	global sqlConn
+	if sqlConn is None:
+		sqlConn = sql.connect(dirSource + sqlDBname) # Make connection
+		migrate_db(sqlConn)
+	return sqlConn
+
+# Function to Get Shared HTTP Connection Pool
+def get_http():
+	global httpPool
+	if httpPool is None:
+		import urllib3
+		urllib3.disable_warnings() # Disable SSL Warnings from Renew London API
+		httpPool = urllib3.PoolManager(timeout=urllib3.Timeout(total=secHttpTimeout)) # Hung request raises before fetch deadline
+	return httpPool
+
+# Function to Resolve Time Zone for CIFS Timestamps
+def get_tz():
+	global tzLocal
+	if tzLocal is None:
+		try:
+			from zoneinfo import ZoneInfo # Python 3.9+
+			tzLocal = ZoneInfo(tzName)
+		except Exception:
+			tzLocal = datetime.now(timezone.utc).astimezone().tzinfo # Fall back to system local time
+			if tzName:
+				print("WARNING: Time zone " + tzName + " unavailable, using system local time!!")
+	return tzLocal
+
+# Function to Convert GIS Feature Collection to Table Rows
+def gisdata_rows(gisData):
+	for incident in gisData['features']:
+		yield (
+			incident["id"],
+			coord_to_blob(incident["geometry"]["coordinates"]),
+			incident["properties"]["Street"],
+			incident["properties"]["StartDate"] / 1000,
+			incident["properties"]["EndDate"] / 1000
+			)
+
+# Function to Compress Bytes as Deterministic Gzip Stream
+def gzip_bytes(bData):
+	oBuffer = io.BytesIO()
+	with gzip.GzipFile(fileobj=oBuffer, mode="wb", compresslevel=9, mtime=0) as gz:
+		gz.write(bData)
+	return oBuffer.getvalue()
+
+# Function to Fetch URL with Conditional GET Against Source Cache, Returning (body, unchanged since last load)
+def http_get_cached(sKey, sURL):
+	dEntry = load_source_cache().get(sKey, {})
+	dHeaders = {"Accept-Encoding": "gzip"}
+	if bConditionalGet and (dbSyncMode == "incremental" or os.path.exists(source_body_path(sKey))): # Reload needs cached body to stand in for 304
+		if dEntry.get("etag"):
+			dHeaders["If-None-Match"] = dEntry["etag"]
+		if dEntry.get("last_modified"):
+			dHeaders["If-Modified-Since"] = dEntry["last_modified"]
+	response = get_http().request("GET", sURL, headers=dHeaders)
+	dHttp = dRunStatus.setdefault("http", {"requests": 0, "hits": 0, "bytes": 0})
+	dHttp["requests"] += 1
+	dHttp["bytes"] += response.tell() # Bytes read off the wire, before gzip decoding
+	if response.status == 304:
+		dHttp["hits"] += 1
+		msg = "SUCCESS: " + sKey + " source not modified, " + str(response.tell()) + " body bytes transferred!!"
+		print(msg)
+		msg_log(curUnixTime, msg)
+		getattr(tlsFetch, "pending", dCachePending)[sKey] = dict(dEntry) # Refresh load time only
+		sBody = None if dbSyncMode == "incremental" else load_source_body(sKey) # Incremental caller skips load
+		return (None if sBody is None else sBody.encode('utf-8')), True
+	if response.status != 200:
+		return None, False
+	bBody = response.data
+	sHash = hashlib.sha256(bBody).hexdigest()
+	bUnchanged = sHash == dEntry.get("sha256")
+	if bUnchanged:
+		dHttp["hits"] += 1 # Validators missing or ignored by server, but body identical
+	getattr(tlsFetch, "pending", dCachePending)[sKey] = {
+		"etag": response.headers.get("ETag"),
+		"last_modified": response.headers.get("Last-Modified"),
+		"sha256": sHash,
+		"body": bBody.decode('utf-8')
+		}
+	return bBody, bUnchanged
+
+# Function to Keep Bounding Box Index in Sync with Written and Removed gisdata Rows (None rebuilds index)
+def index_geometry(c, lRows, lRemoved):
+	if not bSpatialIndex:
+		return
+	if lRemoved is None:
+		c.execute("DELETE FROM gisdata_rtree")
+	else:
+		c.executemany("DELETE FROM gisdata_rtree WHERE id=?", lRemoved)
+	c.executemany(sqlRepRtree, [(row[0],) + blob_bbox(row[1]) for row in lRows])
 	return
 
 # Function to Initialize CIFS XML File
-def init_xml(timestamp):
+def init_xml(fh, timestamp):
 	xmltxt = '<?xml version="1.0" encoding="UTF-8"?>\n'
 	xmltxt += '<incidents xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
 	xmltxt += 'xsi:noNamespaceSchemaLocation="' + XMLschema
 	xmltxt += '" timestamp="' + timestamp + '">\n'
-	with open(dirSource + fCIFSxml, "w") as fh:
-		fh.write(xmltxt)
+	fh.write(xmltxt)
 	return
 
+# Function to Calculate Distance from Point to Packed Geometry in Metres (local equirectangular projection)
+def line_distance(aValues, fLat, fLon):
+	ky = 110540.0 / coordScale
+	kx = 111320.0 * math.cos(math.radians(fLat)) / coordScale
+	fLat, fLon = fLat * coordScale, fLon * coordScale
+	lXY = [((aValues[i + 1] - fLon) * kx, (aValues[i] - fLat) * ky) for i in range(0, len(aValues), 2)]
+	mMin = math.hypot(lXY[0][0], lXY[0][1])
+	for i in range(1, len(lXY)):
+		x0, y0 = lXY[i - 1]
+		dx, dy = lXY[i][0] - x0, lXY[i][1] - y0
+		fLen2 = dx * dx + dy * dy
+		t = 0.0 if fLen2 == 0 else max(0.0, min(1.0, -(x0 * dx + y0 * dy) / fLen2)) # Closest point on segment
+		mMin = min(mMin, math.hypot(x0 + t * dx, y0 + t * dy))
+	return mMin
+
+# Function to Test Whether Packed Geometry Intersects Bounding Box (Liang-Barsky segment clipping)
+def line_in_bbox(aValues, tBox):
+	fMinLat, fMinLon, fMaxLat, fMaxLon = [value * coordScale for value in tBox]
+	lat0, lon0 = aValues[0], aValues[1]
+	if fMinLat <= lat0 <= fMaxLat and fMinLon <= lon0 <= fMaxLon:
+		return True
+	for i in range(2, len(aValues), 2):
+		lat1, lon1 = aValues[i], aValues[i + 1]
+		if fMinLat <= lat1 <= fMaxLat and fMinLon <= lon1 <= fMaxLon:
+			return True
+		t0, t1 = 0.0, 1.0
+		dLat, dLon = lat1 - lat0, lon1 - lon0
+		for p, q in ((-dLat, lat0 - fMinLat), (dLat, fMaxLat - lat0), (-dLon, lon0 - fMinLon), (dLon, fMaxLon - lon0)):
+			if p == 0:
+				if q < 0:
+					break # Parallel to and outside this edge
+			elif p < 0:
+				t0 = max(t0, q / p)
+			else:
+				t1 = min(t1, q / p)
+			if t0 > t1:
+				break
+		else:
+			return True # Segment crosses box
+		lat0, lon0 = lat1, lon1
+	return False
+
+# Function to List Captures of Active Adapter in Files and Directories as (time, path), Oldest First
+def list_captures(lPaths):
+	sPrefix = os.path.splitext(sqlDBname)[0] + "-"
+	lCaptures = []
+	for sPath in lPaths:
+		lFiles = [os.path.join(sPath, sName) for sName in os.listdir(sPath)] if os.path.isdir(sPath) else [sPath]
+		for sFile in lFiles:
+			sName = os.path.basename(sFile)
+			if sName.startswith(sPrefix) and sName.endswith(".json.gz") and sName[len(sPrefix):-8].isdigit():
+				lCaptures.append((int(sName[len(sPrefix):-8]), sFile))
+	return sorted(lCaptures)
+
+# Function to Compile CIFS XML Schema Once per Process
+def load_schema():
+	global xsdSchema
+	if xsdSchema is None:
+		try:
+			from lxml import etree # Optional, enables in-process validation
+		except ImportError:
+			return None # Fall back to 'xmllint' subprocess
+		xsdSchema = etree.XMLSchema(etree.parse(dirSource + fCIFSschema))
+	return xsdSchema
+
+# Function to Read Kept Body of Last Loaded Source (None if not kept or not matching cached hash)
+def load_source_body(sKey):
+	try:
+		with open(source_body_path(sKey), "rb") as fh:
+			bBody = fh.read()
+	except IOError:
+		return None
+	if hashlib.sha256(bBody).hexdigest() != load_source_cache().get(sKey, {}).get("sha256"):
+		return None # Left over from a payload no longer cached
+	return bBody.decode('utf-8')
+
+# Function to Read Source Cache Once per Process
+def load_source_cache():
+	global dSourceCache
+	if dSourceCache is None:
+		dSourceCache = {}
+		if os.path.exists(dirSource + fSourceCache):
+			try:
+				with open(dirSource + fSourceCache) as fh:
+					dSourceCache = json.load(fh)
+			except ValueError:
+				pass # Corrupt cache, next requests fetch in full
+		for dEntry in dSourceCache.values():
+			dEntry.pop("body", None) # Bodies of older caches, now kept in per-part files
+	return dSourceCache
+
 # Function to Loop Forever [TESTING ONLY]
 def loop_forever():
 	while 1:
@@ -456,6 +1482,41 @@ def loop_forever():
 		time.sleep(1)
 	return
 
+# Function to Migrate Existing Database to Current Schema Version
+def migrate_db(conn):
+	global bSpatialIndex
+	iVersion = conn.execute("PRAGMA user_version").fetchone()[0]
+	if iVersion >= iSchemaVersion:
+		return
+	c = conn.cursor()
+	for sSQL in sqlCreateTables:
+		c.execute(sSQL) # New source databases start empty
+	if bSpatialIndex:
+		try:
+			c.execute(sqlCreateRtree) # DDL ahead of transaction
+		except sql.OperationalError:
+			bSpatialIndex = False
+			msg_log(curUnixTime, "WARNING: SQLite R*Tree module unavailable, spatial queries fall back to linear scan!!")
+	iTarget = iSchemaVersion if bSpatialIndex else 1 # Without index, retry on next connect (e.g. after SQLite upgrade)
+	conn.execute("BEGIN")
+	# Version 1: Convert Text Polylines to Packed Geometry BLOBs
+	lRows = c.execute("SELECT id, polyline FROM gisdata WHERE typeof(polyline) = 'text'").fetchall()
+	lUpdates = []
+	for row in lRows:
+		lValues = [float(value) for value in row[1].split()]
+		lUpdates.append((coord_to_blob([[lValues[i + 1], lValues[i]] for i in range(0, len(lValues), 2)]), row[0]))
+	c.executemany("UPDATE gisdata SET polyline=? WHERE id=?", lUpdates)
+	# Version 2: Build Bounding Box Index from Stored Geometry
+	if iVersion < 2 and bSpatialIndex:
+		index_geometry(c, c.execute("SELECT id, polyline FROM gisdata").fetchall(), None)
+	c.execute("PRAGMA user_version = " + str(iTarget))
+	conn.commit() # Commit SQL Changes
+	if iTarget > iVersion:
+		msg = "SUCCESS: Database migrated to schema version " + str(iTarget) + ", " + str(len(lUpdates)) + " polylines packed!!"
+		print(msg)
+		msg_log(curUnixTime, msg)
+	return
+
 # Function to Log Error to File
 def msg_log(timestamp, msg):
 	if "SUCCESS" in msg:
@@ -464,14 +1525,393 @@ def msg_log(timestamp, msg):
 		msgcolor = "color:rgb(255, 165, 0);"
 	else:
 		msgcolor = "color:rgb(255, 0, 0);"
-	logstr = "<span style='" + msgcolor + "'>" + datetime_in_iso(timestamp) + "&nbsp;&nbsp;&nbsp;" + msg + "</span><br />\n"
+	logstr = "<span style='" + msgcolor + "'>" + datetime_in_iso(timestamp) + "&nbsp;&nbsp;&nbsp;" + sLogPrefix + msg + "</span><br />\n"
 	with open(fMsgLog, "a") as fh:
 		fh.write(logstr)
 	return
 
-# Function to Timeout Data Request
-def timeout(signum, frame):
-	raise Exception("ERROR: Data update request has timed out!!")
+# Function to Adapt Update Interval to Churn and Time of Day
+def next_interval(secInterval):
+	nChurn = 0
+	for dCounts in dRunChurn.values():
+		nChurn += dCounts.get("inserted", 0) + dCounts.get("changed", 0) + dCounts.get("removed", 0)
+	if time.localtime().tm_hour in lNightHours:
+		return secIntervalMax
+	if nChurn > 0:
+		return max(secIntervalMin, secInterval / 2) # Poll faster while incidents are changing
+	return min(secIntervalMax, secInterval * 1.5) # Back off while feed is quiet
+
+# Function to Normalize Renew London GIS and Disruptions Payloads to Table Rows
+def normalize_renewlondon(rawData):
+	gisData, apiData = rawData
+	gisRows = None if gisData == rawUnchanged else gisdata_rows(gisData)
+	disruptionRows = None if apiData == rawUnchanged else disruptions_rows(apiData)
+	return gisRows, disruptionRows
+
+# Function to Format One Prometheus Metric Family (source label added to every sample)
+def prom_lines(sName, sType, sHelp, lSamples):
+	if not lSamples:
+		return []
+	lLines = ["# HELP " + sName + " " + sHelp + "\n", "# TYPE " + sName + " " + sType + "\n"]
+	for dLabels, value in lSamples:
+		dLabels = dict(dLabels, source=sAdapter)
+		sLabels = ",".join([key + '="' + str(dLabels[key]).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"' for key in sorted(dLabels)])
+		lLines.append(sName + "{" + sLabels + "} " + repr(float(value)) + "\n")
+	return lLines
+
+# Function to Write Published Feed Manifest
+def publish_manifest(dManifest):
+	write_atomic(dirDest + fCIFSmanifest, json.dumps(dManifest, indent=2).encode('utf-8'))
+	return
+
+# Function to Write Precompressed Sidecars Beside Public CIFS XML File, Returning Manifest to Publish After Feed Swap
+def publish_sidecars(sDigest, nIncidents):
+	from email.utils import formatdate
+	sDest = dirDest + fCIFSxml
+	with open(dirSource + fCIFSxml, "rb") as fh:
+		bXML = fh.read()
+	lSidecars = [(".gz", gzip_bytes(bXML))]
+	if bBrotli:
+		try:
+			import brotli # Optional, '.br' sidecar skipped when unavailable
+			lSidecars.append((".br", brotli.compress(bXML)))
+		except ImportError:
+			pass
+	for sExt, bData in lSidecars:
+		write_atomic(sDest + sExt, bData)
+	dManifest = {
+		"digest": sDigest,
+		"etag": '"' + hashlib.sha256(bXML).hexdigest()[:32] + '"',
+		"last_modified": formatdate(curUnixTime, usegmt=True),
+		"incidents": nIncidents,
+		"bytes": len(bXML),
+		"sidecars": [sExt for sExt, bData in lSidecars]
+		}
+	return dManifest
+
+# Function to Publish CIFS XML File to Public Folder with Atomic Swap
+def publish_xml():
+	sDest = dirDest + fCIFSxml
+	sTemp = sDest + ".tmp"
+	if bPublishSymlink:
+		# Link to a published copy so regenerating the source file never exposes unvalidated output
+		sPublished = dirSource + fCIFSxml + ".published"
+		shutil.copyfile(dirSource + fCIFSxml, sPublished + ".tmp")
+		os.replace(sPublished + ".tmp", sPublished)
+		if os.path.lexists(sTemp):
+			os.remove(sTemp)
+		os.symlink(sPublished, sTemp)
+	else:
+		shutil.copyfile(dirSource + fCIFSxml, sTemp)
+	os.replace(sTemp, sDest) # Readers see either the previous or the new feed, never a partial one
+	return
+
+# Function to Read Published Feed Manifest
+def read_manifest():
+	try:
+		with open(dirDest + fCIFSmanifest) as fh:
+			return json.load(fh)
+	except (IOError, ValueError):
+		return {} # No previous publish recorded
+
+# Function to Reconcile Hash Checksum Table Against Staged Hashes with Set-Based Statements (full feed staged unless removed ids given)
+def reconcile_checksums(c, lChecksum, setRemoved=None):
+	c.execute("DELETE FROM stage_checksum")
+	c.executemany(sqlInsStage, lChecksum)
+	dParams = {"now": curUnixTime}
+	if sql.sqlite_version_info >= (3, 24, 0):
+		c.execute(sqlUpsertChecksum, dParams)
+	else:
+		c.execute(sqlUpdChecksum, dParams)
+		c.execute(sqlInsNewChecksum, dParams)
+	c.execute(sqlCreateFragments)
+	if setRemoved is None:
+		c.execute(sqlDelStaleFragments) # Remove fragments with their checksums, cached 'creationtime' ends with them
+		c.execute(sqlDelStaleChecksum) # Remove checksums for incidents no longer in feed
+	else:
+		lRemoved = [(key,) for key in setRemoved]
+		c.executemany("DELETE FROM fragments WHERE id=?", lRemoved)
+		c.executemany("DELETE FROM checksum WHERE id=?", lRemoved)
+	return
+
+# Function to Render One CIFS XML Incident Record
+def render_incident(incident):
+	xmltxt = '  <incident id="' + escape(str(incident.id)) + '">\n'
+	xmltxt += '    <creationtime>' + incident.creationtime_iso + '</creationtime>\n'
+	xmltxt += '    <updatetime>' + incident.updatetime_iso + '</updatetime>\n'
+	xmltxt += '    <source>\n'
+	xmltxt += '      <reference>' + escape(incident.source["reference"], False) + '</reference>\n'
+	xmltxt += '      <name>' + escape(incident.source["name"], False) + '</name>\n'
+	xmltxt += '      <url>' + escape(incident.source["url"] + '?id=' + str(incident.id), False) + '</url>\n'
+	xmltxt += '    </source>\n'
+	xmltxt += '    <type>' + incident.type + '</type>\n'
+	xmltxt += '    <description>' + escape(incident.short_description, False) + '</description>\n' # USING SHORT DESCRIPTION DUE TO VALIDATION ERROR
+	xmltxt += '    <location>\n'
+	xmltxt += '      <street>' + escape(incident.street, False) + '</street>\n'
+	xmltxt += '      <polyline>' + blob_to_poly(incident.polyline) + '</polyline>\n'
+	xmltxt += '      <direction>' + incident.direction + '</direction>\n'
+	xmltxt += '    </location>\n'
+	xmltxt += '    <starttime>' + incident.starttime_iso + '</starttime>\n'
+	xmltxt += '    <endtime>' + incident.endtime_iso + '</endtime>\n'
+	#xmltxt += '    <short_description>' + incident.short_description + '</short_description>\n'
+	xmltxt += '  </incident>\n'
+	return xmltxt
+
+# Function to Derive Render Key from Render Version and Settings Read by 'render_incident()' (stored in fragments 'version' column)
+def render_key():
+	sSettings = json.dumps([xmlRenderVersion, tzName, coordPrecision, coordScale, sorted(dSourceMeta.items())])
+	return int(hashlib.sha256(sSettings.encode('utf-8')).hexdigest()[:15], 16) # Fits SQLite integer
+
+# Function to Retry Failed Source in Background with Exponential Backoff, Handing Data to Next Fetch
+def retry_source(sKey, fn, future=None):
+	try:
+		if future is not None:
+			try:
+				result = future.result() # Never run alongside a fetch that missed the deadline
+			except:
+				result = (False, {})
+			if result[0]:
+				dRetryResults[sKey] = result
+				evRetry.set()
+				return
+		for i in range(nRetries):
+			time.sleep(secRetryBase * 2 ** i)
+			try:
+				result = fetch_source(fn)
+			except:
+				result = (False, {})
+			if result[0]:
+				dRetryResults[sKey] = result
+				evRetry.set()
+				return
+		msg_log(int(time.time()), "ERROR: Background retries of " + sKey + " source exhausted!!")
+	finally:
+		setRetrying.discard(sKey)
+
+# Function to Record First Failure Reason of Current Run
+def run_failed(sReason):
+	dRunStatus.setdefault("failure", sReason)
+	return
+
+# Function to Simplify Line of [lon, lat] Coordinates with Douglas-Peucker Tolerance in Metres
+def simplify_line(lCoord, mTolerance):
+	np = None
+	if len(lCoord) >= nSimplifyVectorMin:
+		try:
+			import numpy as np # Optional, vectorizes distance computation per segment on long lines
+		except ImportError:
+			pass
+	# Project to local equirectangular metres about first vertex
+	lat0 = lCoord[0][1]
+	kx = 111320.0 * math.cos(math.radians(lat0))
+	ky = 110540.0
+	if np is not None:
+		aXY = np.asarray(lCoord, dtype="float64")[:, :2] * np.array([kx, ky])
+	else:
+		lXY = [(xy[0] * kx, xy[1] * ky) for xy in lCoord]
+	lKeep = [False] * len(lCoord)
+	lKeep[0] = lKeep[-1] = True
+	lStack = [(0, len(lCoord) - 1)]
+	while lStack:
+		iStart, iEnd = lStack.pop()
+		if iEnd - iStart < 2:
+			continue
+		if np is not None:
+			aSeg = aXY[iEnd] - aXY[iStart]
+			aRel = aXY[iStart + 1:iEnd] - aXY[iStart]
+			fLen = math.hypot(aSeg[0], aSeg[1])
+			if fLen == 0:
+				aDist = np.hypot(aRel[:, 0], aRel[:, 1])
+			else:
+				aDist = np.abs(aRel[:, 0] * aSeg[1] - aRel[:, 1] * aSeg[0]) / fLen
+			iMax = int(np.argmax(aDist))
+			fMax = float(aDist[iMax])
+		else:
+			x0, y0 = lXY[iStart]
+			dx, dy = lXY[iEnd][0] - x0, lXY[iEnd][1] - y0
+			fLen = math.hypot(dx, dy)
+			fMax, iMax = -1.0, 0
+			for k in range(iStart + 1, iEnd):
+				rx, ry = lXY[k][0] - x0, lXY[k][1] - y0
+				fDist = abs(rx * dy - ry * dx) / fLen if fLen else math.hypot(rx, ry)
+				if fDist > fMax:
+					fMax, iMax = fDist, k - iStart - 1
+		if fMax > mTolerance:
+			iSplit = iStart + 1 + iMax
+			lKeep[iSplit] = True
+			lStack.append((iStart, iSplit))
+			lStack.append((iSplit, iEnd))
+	return [xy for xy, keep in zip(lCoord, lKeep) if keep]
+
+# Function to Return Path of Kept Body of Source
+def source_body_path(sKey):
+	return dirSource + os.path.splitext(fSourceCache)[0] + "-" + sKey + ".json"
+
+# Function to Bound One Pipeline Stage by Its Own Deadline
+@contextlib.contextmanager
+def stage_deadline(sStage, secDeadline):
+	def expire(signum, frame):
+		raise Exception("ERROR: CIFS XML " + sStage + " stage exceeded " + str(secDeadline) + " s deadline!!")
+	handler = signal.signal(signal.SIGALRM, expire)
+	signal.setitimer(signal.ITIMER_REAL, secDeadline)
+	try:
+		yield
+	finally:
+		signal.setitimer(signal.ITIMER_REAL, 0) # Cancel deadline upon completion
+		signal.signal(signal.SIGALRM, handler)
+
+# Function to Return Source Cache Entry Young Enough to Stand In for Failed Source (None if too old or missing)
+def stale_entry(sKey):
+	dEntry = load_source_cache().get(sKey, {})
+	if secStaleBudget <= 0 or "loaded" not in dEntry or curUnixTime - dEntry["loaded"] > secStaleBudget:
+		return None
+	return dEntry
+
+# Function to Start Virtual Display and Headless Browser
+def start_browser():
+	from pyvirtualdisplay import Display
+	from selenium import webdriver
+	# Initialize Virtual Display
+	display = Display(visible=0, size=(800, 600))
+	display.start()
+	# Selenium Webdriver Options and Start
+	options = webdriver.ChromeOptions()
+	options.add_argument('--no-sandbox')
+	options.add_argument('--headless')
+	driver = webdriver.Chrome("/usr/local/bin/chromedriver", chrome_options=options)
+	driver.set_page_load_timeout(secPageLoad) # Hung page load raises instead of outliving fetch deadline
+	return display, driver
+
+# Function to Start Background Retry of Failed Source Unless One Is Already Running
+def start_retry(sKey, fn, future=None):
+	if nRetries <= 0 or sKey in setRetrying:
+		return
+	setRetrying.add(sKey)
+	threading.Thread(target=retry_source, args=(sKey, fn, future), daemon=True).start()
+	return
+
+# Function to Stop Headless Browser and Virtual Display
+def stop_browser(display, driver):
+	driver.quit() # Close Webdriver and browser process
+	display.sendstop() # Stop Virtual Display
+	return
+
+# Function to Tear Down Browser Sessions of Scrapes in Progress (all unless given)
+def stop_browsers(lStop=None):
+	for tBrowser in list(lBrowsers if lStop is None else lStop):
+		if tBrowser in lBrowsers:
+			lBrowsers.remove(tBrowser)
+		try:
+			stop_browser(*tBrowser)
+		except Exception:
+			pass # Browser or display already gone
+	return
+
+# Function to Run Call on Daemon Thread, Returning Its Future
+def submit_daemon(fn, *args):
+	future = futures.Future()
+	threading.Thread(target=run_future, args=(future, fn, args), daemon=True).start()
+	return future
+
+# Function to Diff Incoming Rows Against Stored Table and Write Only Inserted, Changed and Removed Rows (ids collected in dSynced if given)
+def sync_table(c, sTable, sSQLreplace, rows, fnIndex=None, dSynced=None):
+	dIncoming = dict((row[0], row) for row in rows) # Keyed by id, last duplicate wins
+	dStored = dict((row[0], row) for row in c.execute("SELECT * FROM " + sTable))
+	lInserted = [row for key, row in dIncoming.items() if key not in dStored]
+	lChanged = [row for key, row in dIncoming.items() if key in dStored and dStored[key] != row] # Content compare
+	lRemoved = [(key,) for key in dStored if key not in dIncoming]
+	c.executemany(sSQLreplace, lInserted + lChanged)
+	c.executemany("DELETE FROM " + sTable + " WHERE id=?", lRemoved)
+	if fnIndex is not None:
+		fnIndex(c, lInserted + lChanged, lRemoved) # Keep dependent index in step with written rows
+	if dSynced is not None:
+		dSynced["written"].update(row[0] for row in lInserted + lChanged)
+		dSynced["removed"].update(row[0] for row in lRemoved)
+	return {"inserted": len(lInserted), "changed": len(lChanged), "removed": len(lRemoved)}
+
+# Function to Run Pipeline Stage and Record Duration
+def time_stage(sStage, fn, *args):
+	tStart = time.time()
+	try:
+		return fn(*args)
+	finally:
+		dRunTimes[sStage] = time.time() - tStart
+
+# Function to Unpack Geometry BLOB as Sequence of Fixed-Point Values (zero-copy on little-endian hosts)
+def unpack_blob(bGeometry):
+	if sys.byteorder == "little":
+		return memoryview(bGeometry).cast("i")
+	aValues = array.array("i")
+	aValues.frombytes(bGeometry)
+	aValues.byteswap()
+	return aValues
+
+# Function to Switch Module State to One Source Adapter (database, feed, snapshot, manifest and source metadata)
+def use_adapter(sName):
+	global sAdapter, dSourceMeta, sqlDBname, fCIFSxml, fCIFSmanifest, fSnapshot, fMetrics, fRunSummary, fSourceCache, dSourceCache, sqlConn
+	dAdapter = dAdapters[sName]
+	if sqlConn is not None and sqlDBname != dAdapter["db"]:
+		sqlConn.close() # Connection belongs to previous adapter's database
+		sqlConn = None
+	sAdapter = sName
+	dSourceMeta = dict((key, sys.intern(value)) for key, value in dAdapter["source"].items())
+	sqlDBname = dAdapter["db"]
+	fCIFSxml = dAdapter["xml"]
+	fCIFSmanifest = os.path.splitext(dAdapter["xml"])[0] + ".manifest.json"
+	fSnapshot = os.path.splitext(dAdapter["db"])[0] + "-snapshot.json"
+	fMetrics = os.path.splitext(dAdapter["db"])[0] + ".prom"
+	fRunSummary = os.path.splitext(dAdapter["db"])[0] + "-run.json"
+	if fSourceCache != os.path.splitext(dAdapter["db"])[0] + "-cache.json":
+		fSourceCache = os.path.splitext(dAdapter["db"])[0] + "-cache.json"
+		dSourceCache = None # Cache belongs to previous adapter
+	return
+
+# Function to Validate CIFS XML File Against Schema and Return Per-Incident Errors
+def validate_xml(sPath):
+	schema = load_schema()
+	lErrors = []
+	if schema is None:
+		chkSchema = subprocess.getoutput('xmllint --schema ' + dirSource + fCIFSschema + ' --noout ' + sPath)
+		if chkSchema != sPath + " validates":
+			for line in chkSchema.splitlines():
+				parts = line.split(":", 2) # file:line: message
+				if len(parts) == 3 and parts[1].isdigit():
+					lErrors.append({"incident": None, "path": None, "line": int(parts[1]), "message": parts[2].strip()})
+			if not lErrors:
+				lErrors.append({"incident": None, "path": None, "line": None, "message": chkSchema})
+		return lErrors
+	from lxml import etree
+	try:
+		doc = etree.parse(sPath)
+	except etree.XMLSyntaxError as exc:
+		return [{"incident": None, "path": None, "line": exc.lineno, "message": str(exc)}]
+	if schema.validate(doc):
+		return lErrors
+	lIncidents = doc.getroot().findall("incident")
+	for entry in schema.error_log:
+		match = re.match(r"/incidents/incident\[(\d+)\]", entry.path or "")
+		incident = None
+		if match:
+			incident = lIncidents[int(match.group(1)) - 1].get("id")
+		elif (entry.path or "").startswith("/incidents/incident"): # Only incident, path has no index
+			incident = lIncidents[0].get("id")
+		lErrors.append({"incident": incident, "path": entry.path, "line": entry.line, "message": entry.message})
+	return lErrors
+
+# Function to Wait for GIS Data to Populate in Browser
+def wait_for_gis(driver):
+	from selenium.webdriver.support.ui import WebDriverWait
+	tStart = time.time()
+	try:
+		return WebDriverWait(driver, secPageWait, poll_frequency=secPoll).until(lambda d: d.execute_script(apiJSready))
+	finally:
+		dRunTimes["page_wait"] = time.time() - tStart # Record wait duration, including on deadline expiry
+
+# Function to Write File Contents Atomically via Temporary File and Rename
+def write_atomic(sPath, bData):
+	with open(sPath + ".tmp", "wb") as fh:
+		fh.write(bData)
+	os.replace(sPath + ".tmp", sPath)
 	return
 
 # NAMESPACE CALL (DO NOT MODIFY)